@@ -0,0 +1,103 @@
+"""
+Benchmark: sequential vs process-pool analyze_frames scaling.
+
+Run from the project root:
+    python -m benchmarks.bench_parallel_frames --frames 200 --workers 1 2 4
+
+Uses the real FER detector when installed, otherwise a CPU-bound
+stand-in with the same detect_emotions() interface.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from video_emotion import emotion_core
+from video_emotion.parallel import ParallelFrameAnalyzer
+
+EMOTIONS = ("angry", "disgust", "fear", "happy", "sad", "surprise", "neutral")
+
+# =====================================================
+# STAND-IN DETECTOR
+# =====================================================
+class StandInDetector:
+    """
+    Deterministic detector doing roughly CNN-sized work per frame.
+    """
+
+    def detect_emotions(self, frame):
+        gray = frame.mean(axis=2, dtype=np.float32) / 255.0
+        feat = gray[:128, :128]
+        for _ in range(40):
+            feat = np.tanh(feat @ feat.T / len(feat))
+
+        seed = float(gray[::37, ::37].sum()) % 1.0
+        scores = [(seed * (i + 3)) % 1.0 for i in range(len(EMOTIONS))]
+        return [{"box": (0, 0, 64, 64), "emotions": dict(zip(EMOTIONS, scores))}]
+
+
+def stand_in_factory():
+    return StandInDetector()
+
+
+def detector_factory():
+    try:
+        import fer  # noqa: F401
+    except ImportError:
+        return stand_in_factory
+    return emotion_core._load_detector
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [
+        rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8)
+        for _ in range(args.frames)
+    ]
+
+    factory = detector_factory()
+    emotion_core.registry.override("fer_detector", factory())
+
+    # Whole stream, no early exit, so every mode does the same work
+    options = {"max_seconds": None, "min_samples": None}
+
+    start = time.perf_counter()
+    expected = emotion_core.analyze_frames(iter(frames), **options)
+    sequential = time.perf_counter() - start
+    print(f"sequential: {args.frames / sequential:7.1f} frames/s")
+
+    for workers in args.workers:
+        with ParallelFrameAnalyzer(workers=workers, detector_factory=factory) as analyzer:
+            # Warm the pool (detector load) outside the timed run
+            analyzer.analyze_frames(iter(frames[:workers]), **options)
+
+            start = time.perf_counter()
+            result = analyzer.analyze_frames(iter(frames), **options)
+            elapsed = time.perf_counter() - start
+
+        result.pop("analysis_seconds", None)
+        assert result == {
+            k: v for k, v in expected.items() if k != "analysis_seconds"
+        }, "parallel result differs from sequential"
+
+        print(
+            f"workers={workers:<3} {args.frames / elapsed:7.1f} frames/s  "
+            f"(x{sequential / elapsed:.2f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark: vectorized encode_texts vs the per-text encode path.
+
+Run from the project root:
+    python -m benchmarks.bench_text_encode --texts 20000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from text_engine.tokenizer import encode_texts
+from text_engine.vocab import IDS_PATH, KEYS_PATH, META_PATH, VocabIndex, build_vocab_index
+
+VOCAB_SIZE = 10000
+MAX_LEN = 200
+
+# =====================================================
+# FIXTURES
+# =====================================================
+def load_vocab():
+    """
+    Use the real vocabulary table if built, else a synthetic one.
+    """
+    if all(os.path.exists(p) for p in (KEYS_PATH, IDS_PATH, META_PATH)):
+        return VocabIndex()
+
+    tmp_dir = tempfile.mkdtemp(prefix="vocab_bench_")
+    keys_path = os.path.join(tmp_dir, "keys.npy")
+    ids_path = os.path.join(tmp_dir, "ids.npy")
+
+    word_index = {f"w{i}": i for i in range(1, 2 * VOCAB_SIZE)}
+    build_vocab_index(VOCAB_SIZE, word_index, keys_path, ids_path)
+
+    return VocabIndex(keys_path, ids_path)
+
+
+def make_texts(vocab, n, seed=0):
+    rng = random.Random(seed)
+    words = [w.decode("utf-8") for w in vocab.keys[:5000]] + ["unknownword"]
+
+    return [
+        " ".join(rng.choice(words) for _ in range(rng.randint(5, 300)))
+        for _ in range(n)
+    ]
+
+# =====================================================
+# REFERENCE: PER-TEXT PATHS
+# =====================================================
+def _pad_row(encoded):
+    # pad_sequences(padding="post", truncating="post") on one row
+    row = np.zeros((1, MAX_LEN), dtype=np.int32)
+    encoded = encoded[:MAX_LEN]
+    row[0, :len(encoded)] = encoded
+    return row
+
+
+def encode_per_text(texts, vocab):
+    """
+    One vocab lookup + one padded row per text.
+    """
+    rows = []
+    for text in texts:
+        encoded = vocab.lookup(text.lower().split())
+        rows.append(_pad_row(encoded if len(encoded) else [2]))
+
+    return np.vstack(rows)
+
+
+def encode_per_text_dict(texts, word_index):
+    """
+    Original loop over an in-memory word_index dict.
+    """
+    rows = []
+    for text in texts:
+        encoded = [
+            idx if idx < VOCAB_SIZE else 2
+            for idx in (word_index.get(w, 2) for w in text.lower().split())
+        ] or [2]
+        rows.append(_pad_row(encoded))
+
+    return np.vstack(rows)
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    vocab = load_vocab()
+    word_index = {
+        k.decode("utf-8"): int(i) for k, i in zip(vocab.keys, vocab.ids)
+    }
+    texts = make_texts(vocab, args.texts)
+
+    candidates = (
+        ("per_text_dict", lambda: encode_per_text_dict(texts, word_index)),
+        ("per_text", lambda: encode_per_text(texts, vocab)),
+        ("vectorized", lambda: encode_texts(texts, vocab, MAX_LEN)),
+    )
+
+    expected = candidates[0][1]()
+    for name, fn in candidates[1:]:
+        assert np.array_equal(expected, fn()), f"{name} disagrees"
+
+    for name, fn in candidates:
+        best = min(_timed(fn) for _ in range(args.repeats))
+        print(
+            f"{name:>13}: {best:.3f}s  "
+            f"({args.texts / best:,.0f} texts/s)"
+        )
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: full FER detection vs tracking mode on a video file.
+
+Run from the project root:
+    python -m benchmarks.bench_tracking path/to/clip.mp4 --keyframe-interval 10
+
+Reports throughput, how many frames needed the Haar + CNN pass, and the
+accuracy delta of tracking mode against per-frame detection:
+top-emotion agreement, mean absolute score error and the change in the
+final emotion distribution.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from video_emotion import emotion_core
+from video_emotion.emotion_core import FrameDetections
+from video_emotion.frame_sources import SAMPLE_FPS, video_file_frames
+from video_emotion.tracking import (
+    KEYFRAME_INTERVAL,
+    MOTION_THRESHOLD,
+    REKEY_THRESHOLD,
+    TrackedEmotionDetector,
+)
+
+# =====================================================
+# HELPERS
+# =====================================================
+def run(detector, frames):
+    outputs = []
+    start = time.perf_counter()
+    for frame in frames:
+        try:
+            outputs.append(detector.detect_emotions(frame) or [])
+        except Exception:
+            outputs.append([])
+    return outputs, time.perf_counter() - start
+
+
+def top_face(detections):
+    # First face, the one EmotionAggregator scores
+    if not detections:
+        return None
+    return detections[0].get("emotions") or None
+
+
+def summary(frames, outputs):
+    result = emotion_core.analyze_frames(
+        (FrameDetections(f, d) for f, d in zip(frames, outputs)),
+        max_seconds=None,
+        min_samples=None
+    )
+    return result.get("emotion_distribution", {})
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("video")
+    parser.add_argument("--sample-fps", type=float, default=SAMPLE_FPS)
+    parser.add_argument("--keyframe-interval", type=int, default=KEYFRAME_INTERVAL)
+    parser.add_argument("--motion-threshold", type=float, default=MOTION_THRESHOLD)
+    parser.add_argument("--rekey-threshold", type=float, default=REKEY_THRESHOLD)
+    args = parser.parse_args()
+
+    frames = list(video_file_frames(args.video, sample_fps=args.sample_fps))
+    detector = emotion_core.get_detector()
+
+    full, full_seconds = run(detector, frames)
+
+    tracker = TrackedEmotionDetector(
+        detector,
+        keyframe_interval=args.keyframe_interval,
+        motion_threshold=args.motion_threshold,
+        rekey_threshold=args.rekey_threshold
+    )
+    tracked, tracked_seconds = run(tracker, frames)
+
+    agree, errors, compared = 0, [], 0
+    for a, b in zip(full, tracked):
+        ea, eb = top_face(a), top_face(b)
+        if ea is None or eb is None:
+            continue
+        compared += 1
+        agree += max(ea, key=ea.get) == max(eb, key=eb.get)
+        errors.append(np.mean([abs(ea[k] - eb.get(k, 0.0)) for k in ea]))
+
+    full_avg = summary(frames, full)
+    tracked_avg = summary(frames, tracked)
+    drift = max(
+        (abs(full_avg.get(k, 0.0) - tracked_avg.get(k, 0.0))
+         for k in set(full_avg) | set(tracked_avg)),
+        default=0.0
+    )
+
+    stats = tracker.stats
+    print(f"frames:            {len(frames)}")
+    print(f"full detection:    {len(frames) / full_seconds:7.1f} frames/s")
+    print(
+        f"tracking mode:     {len(frames) / tracked_seconds:7.1f} frames/s  "
+        f"(x{full_seconds / tracked_seconds:.2f})"
+    )
+    print(
+        f"tracking calls:    full={stats['full']} roi={stats['roi']} "
+        f"reused={stats['reused']}"
+    )
+    if compared:
+        print(f"top-emotion agree: {agree / compared:.1%} of {compared} frames with a face in both")
+        print(f"mean score error:  {float(np.mean(errors)):.4f}")
+    print(f"distribution drift: {drift:.2f} pts (max abs per emotion)")
+
+
+if __name__ == "__main__":
+    main()
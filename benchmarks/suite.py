@@ -0,0 +1,433 @@
+"""
+End-to-end benchmark suite for every inference path.
+
+Run from the project root:
+    python -m benchmarks.suite --out bench/HEAD.json
+    python -m benchmarks.suite --compare bench/main.json
+
+Measures latency percentiles and throughput for analyze_text,
+analyze_questionnaire, fuse_results and analyze_frames, cold-start
+import time per engine (fresh interpreter each) and peak RSS. Results
+are JSON so runs can be diffed across commits; --compare exits non-zero
+when a metric regresses by more than --tolerance.
+
+Runs offline on CPU: missing weights or optional packages (TensorFlow,
+FER) are replaced by small stand-in models through registry.override,
+and the JSON records which stand-ins were used.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from model_registry import peak_rss_mb, registry
+
+ENGINE_MODULES = {
+    "text": "text_engine.inference",
+    "questionnaire": "questionnaire_engine.inference",
+    "fusion": "fusion_engine.fuse_results",
+    "video": "video_emotion.emotion_core",
+    "flask_app": "flask_app.app",
+}
+
+QUESTION_COLUMNS = ["Q1A", "Q6A", "Q8A", "Q11A", "Q12A", "Q14A", "Q18A"]
+
+# =====================================================
+# STAND-IN MODELS
+# =====================================================
+class StandInSentimentModel:
+    """
+    Embedding → mean pool → dense → sigmoid, same predict() signature
+    as the Keras model (ids in, (N, 1) scores out).
+    """
+
+    def __init__(self, vocab_size, dim=32, seed=0):
+        rng = np.random.default_rng(seed)
+        self.embedding = rng.normal(0, 1, (vocab_size, dim)).astype(np.float32)
+        self.weights = rng.normal(0, 1, (dim, 1)).astype(np.float32)
+
+    def predict(self, x, verbose=0):
+        x = np.asarray(x)
+        mask = (x > 0)[..., None]
+        pooled = (self.embedding[x] * mask).sum(1) / np.maximum(mask.sum(1), 1)
+        return 1.0 / (1.0 + np.exp(-(pooled @ self.weights)))
+
+
+def install_stand_ins():
+    """
+    Override registry entries whose real weights/packages are missing.
+    Returns the names of the stand-ins used.
+    """
+    from text_engine import inference as text_inference
+    from benchmarks.bench_text_encode import load_vocab
+    from benchmarks.bench_parallel_frames import StandInDetector
+
+    used = []
+
+    has_numpy_export = (
+        text_inference.BACKEND != "keras" and os.path.exists(text_inference.NPZ_PATH)
+    )
+    if not has_numpy_export and (
+        not os.path.exists(text_inference.MODEL_PATH) or not _importable("tensorflow")
+    ):
+        registry.override(
+            "sentiment_model", StandInSentimentModel(text_inference.VOCAB_SIZE)
+        )
+        used.append("sentiment_model")
+
+    from text_engine.vocab import IDS_PATH, KEYS_PATH, META_PATH
+    if not all(os.path.exists(p) for p in (KEYS_PATH, IDS_PATH, META_PATH)):
+        registry.override("text_vocab", load_vocab())
+        used.append("text_vocab")
+
+    import video_emotion.emotion_core  # noqa: F401 (registers fer_detector)
+    if not _importable("fer"):
+        registry.override("fer_detector", StandInDetector())
+        used.append("fer_detector")
+
+    return used
+
+
+def _importable(name):
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+# =====================================================
+# FIXTURES
+# =====================================================
+def make_texts(n, seed=0):
+    rng = random.Random(seed)
+    words = (
+        "i feel tired anxious happy calm stressed okay great sad work "
+        "sleep family friends today tomorrow never always really very"
+    ).split()
+    return [
+        " ".join(rng.choice(words) for _ in range(rng.randint(3, 60)))
+        for _ in range(n)
+    ]
+
+
+def make_answers(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {q: rng.randint(1, 4) for q in QUESTION_COLUMNS}
+        for _ in range(n)
+    ]
+
+
+def make_fusion_inputs(n, seed=0):
+    rng = random.Random(seed)
+    levels = ["Low", "Moderate", "High"]
+
+    def result(source):
+        if rng.random() < 0.2:
+            return None
+        return {
+            "source": source,
+            "risk_level": rng.choice(levels),
+            "confidence": round(rng.random(), 2)
+        }
+
+    return [
+        {"text": result("text"), "video": result("video"),
+         "questionnaire": result("questionnaire")}
+        for _ in range(n)
+    ]
+
+
+def load_frames(path, n, seed=0):
+    """
+    Recorded fixture (.npy, (N, H, W, 3) uint8) or synthetic frames.
+    """
+    if path:
+        return list(np.load(path, mmap_mode="r")[:n])
+
+    rng = np.random.default_rng(seed)
+    return [
+        rng.integers(0, 256, size=(240, 320, 3), dtype=np.uint8)
+        for _ in range(n)
+    ]
+
+# =====================================================
+# MEASUREMENT
+# =====================================================
+def latency(fn, inputs, warmup=5):
+    """
+    Per-call latency percentiles (ms) and calls/s over `inputs`.
+    """
+    for item in inputs[:warmup]:
+        fn(item)
+
+    samples = np.empty(len(inputs))
+    start = time.perf_counter()
+    for i, item in enumerate(inputs):
+        t = time.perf_counter()
+        fn(item)
+        samples[i] = time.perf_counter() - t
+    total = time.perf_counter() - start
+
+    ms = samples * 1000
+    return {
+        "calls": len(inputs),
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p90_ms": round(float(np.percentile(ms, 90)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "mean_ms": round(float(ms.mean()), 4),
+        "throughput_per_s": round(len(inputs) / total, 2),
+    }
+
+
+def throughput(fn, items, batch_size):
+    """
+    Items/s when `fn` is called on batches of `batch_size`.
+    """
+    fn(items[:batch_size])
+    start = time.perf_counter()
+    for i in range(0, len(items), batch_size):
+        fn(items[i:i + batch_size])
+    return {
+        "items": len(items),
+        "batch_size": batch_size,
+        "throughput_per_s": round(len(items) / (time.perf_counter() - start), 2),
+    }
+
+
+def concurrent_throughput(fn, items, threads):
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(fn, items[:threads]))
+        start = time.perf_counter()
+        list(pool.map(fn, items))
+        elapsed = time.perf_counter() - start
+    return {
+        "items": len(items),
+        "threads": threads,
+        "throughput_per_s": round(len(items) / elapsed, 2),
+    }
+
+
+def cold_start(module, runs=3):
+    """
+    Import `module` in fresh interpreters; best-of-`runs` seconds and
+    peak RSS (best-of keeps small imports from being pure noise).
+    """
+    samples = [_cold_start_once(module) for _ in range(runs)]
+    failed = [s for s in samples if "error" in s]
+    if failed:
+        return failed[0]
+    return {
+        "import_seconds": min(s["import_seconds"] for s in samples),
+        "peak_rss_mb": min(s["peak_rss_mb"] for s in samples),
+    }
+
+
+def _cold_start_once(module):
+    code = (
+        "import json, time\n"
+        "t = time.perf_counter()\n"
+        f"import {module}\n"
+        "seconds = time.perf_counter() - t\n"
+        "from model_registry import peak_rss_mb\n"
+        "print(json.dumps({'import_seconds': round(seconds, 4), "
+        "'peak_rss_mb': round(peak_rss_mb(), 1)}))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "PYTHONPATH": PROJECT_ROOT, "PRELOAD_MODELS": ""},
+        capture_output=True,
+        text=True,
+        timeout=600,
+    )
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        return {"error": lines[-1] if lines else f"exit {proc.returncode}"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+# =====================================================
+# SUITE
+# =====================================================
+def run_suite(args):
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "result_cache": args.with_cache,
+        },
+        "cold_start": {},
+        "latency": {},
+        "throughput": {},
+    }
+
+    if not args.skip_cold_start:
+        for engine, module in ENGINE_MODULES.items():
+            results["cold_start"][engine] = cold_start(module, args.cold_runs)
+            print(f"cold start {engine:<14} {results['cold_start'][engine]}")
+
+    results["meta"]["stand_ins"] = install_stand_ins()
+
+    from text_engine.inference import analyze_text, analyze_texts
+    from questionnaire_engine.inference import (
+        analyze_questionnaire,
+        analyze_questionnaires,
+    )
+    from fusion_engine.fuse_results import fuse_results
+    from video_emotion.emotion_core import analyze_frames
+
+    texts = make_texts(args.calls)
+    answers = make_answers(args.calls)
+    fusion_inputs = make_fusion_inputs(args.calls)
+    frames = load_frames(args.frames_npy, args.frames)
+    clips = [frames] * max(1, args.calls // 50)
+
+    def frames_call(clip):
+        analyze_frames(iter(clip), max_seconds=None, min_samples=None)
+
+    results["latency"] = {
+        "analyze_text": latency(analyze_text, texts),
+        "analyze_questionnaire": latency(analyze_questionnaire, answers),
+        "fuse_results": latency(
+            lambda kw: fuse_results(
+                text_result=kw["text"],
+                video_result=kw["video"],
+                questionnaire_result=kw["questionnaire"]
+            ),
+            fusion_inputs
+        ),
+        "analyze_frames": latency(frames_call, clips, warmup=1),
+    }
+    results["latency"]["analyze_frames"]["frames_per_call"] = len(frames)
+
+    results["throughput"] = {
+        "analyze_texts": throughput(analyze_texts, texts, args.batch_size),
+        "analyze_text_concurrent": concurrent_throughput(
+            analyze_text, texts, args.threads
+        ),
+        "analyze_questionnaires": throughput(
+            analyze_questionnaires, answers, args.batch_size
+        ),
+    }
+
+    results["memory"] = {
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "models": registry.report(),
+    }
+    return results
+
+# =====================================================
+# REGRESSION COMPARE
+# =====================================================
+def compare(current, baseline, tolerance):
+    """
+    Print per-metric deltas (positive = worse); return the names of
+    regressed metrics.
+    Lower is better for *_ms, *_seconds and *_mb; higher for throughput.
+    """
+    regressions = []
+
+    def walk(cur, base, path):
+        for key, value in cur.items():
+            if key not in base:
+                continue
+            name = f"{path}.{key}" if path else key
+            if isinstance(value, dict):
+                walk(value, base[key], name)
+                continue
+            if not isinstance(value, (int, float)) or not base[key]:
+                continue
+
+            if key.endswith(("_ms", "_seconds", "_mb")):
+                change = (value - base[key]) / base[key]
+            elif key.startswith("throughput"):
+                change = (base[key] - value) / base[key]
+            else:
+                continue
+
+            flag = "❌" if change > tolerance else "  "
+            print(f"{flag} {name:<55} {base[key]:>12} → {value:<12} ({change:+.1%})")
+            if change > tolerance:
+                regressions.append(name)
+
+    for section in ("cold_start", "latency", "throughput"):
+        walk(current.get(section, {}), baseline.get(section, {}), section)
+    walk(
+        {"peak_rss_mb": current["memory"]["peak_rss_mb"]},
+        {"peak_rss_mb": baseline.get("memory", {}).get("peak_rss_mb", 0)},
+        "memory"
+    )
+    return regressions
+
+# =====================================================
+# CLI
+# =====================================================
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--frames", type=int, default=30,
+                        help="frames per analyze_frames call")
+    parser.add_argument("--frames-npy", help="recorded (N, H, W, 3) uint8 frames")
+    parser.add_argument("--cold-runs", type=int, default=3)
+    parser.add_argument("--skip-cold-start", action="store_true")
+    parser.add_argument("--with-cache", action="store_true",
+                        help="keep the result cache on (default: measure the model path)")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative regression (default 0.2)")
+    args = parser.parse_args()
+
+    # Fixtures repeat across sections; without this later runs are all hits
+    if not args.with_cache:
+        os.environ["RESULT_CACHE_MAX"] = "0"
+
+    results = run_suite(args)
+    print(json.dumps(results, indent=2))
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results saved: {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} metric(s) regressed beyond {args.tolerance:.0%}")
+            sys.exit(1)
+        print("✅ No regressions beyond tolerance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import math
+import os
+
+from flask import Blueprint, jsonify, request
+
+from text_engine.inference import analyze_text, analyze_texts
+from questionnaire_engine.inference import (
+    analyze_questionnaire,
+    analyze_questionnaires,
+)
+from fusion_engine.fuse_results import fuse_results
+from instrumentation import stage
+
+# =====================================================
+# JSON INFERENCE API (v1)
+# =====================================================
+# Stateless: no session cookie, no dashboard record. Responses are the
+# standardized engine dicts. Models come from the shared registry, so
+# each gunicorn worker loads them once.
+api_v1 = Blueprint("api_v1", __name__, url_prefix="/api/v1")
+
+MAX_BATCH = int(os.environ.get("API_MAX_BATCH", 256))
+
+FUSION_INPUTS = ("text", "video", "questionnaire")
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+@api_v1.errorhandler(ApiError)
+def handle_api_error(e):
+    return jsonify({"status": "error", "message": e.message}), e.status
+
+# =====================================================
+# VALIDATION
+# =====================================================
+def json_body():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise ApiError("JSON object body required")
+    return data
+
+
+def batch_field(data, key):
+    items = data.get(key)
+    if not isinstance(items, list):
+        raise ApiError(f"'{key}' must be a list")
+    if len(items) > MAX_BATCH:
+        raise ApiError(f"batch too large (max {MAX_BATCH})", 413)
+    return items
+
+
+def check_text(text):
+    if not isinstance(text, str) or not text.strip():
+        raise ApiError("'text' must be a non-empty string")
+    return text
+
+
+def check_answers(answers):
+    if not isinstance(answers, dict) or not answers:
+        raise ApiError("'answers' must be a non-empty object")
+
+    # Same rule as the form: whole-number answers only
+    for key, value in answers.items():
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise ApiError(f"answer '{key}' must be a non-negative integer")
+    return answers
+
+
+def check_engine_result(key, result):
+    """
+    An engine result as fusion reads it: string source / risk_level,
+    finite numeric confidence (optional). The source must match the
+    key it was sent under; a missing source is taken from the key.
+    """
+    if result is None:
+        return None
+    if not isinstance(result, dict):
+        raise ApiError(f"'{key}' must be an engine result object or null")
+
+    for field in ("source", "risk_level"):
+        if field in result and not isinstance(result[field], str):
+            raise ApiError(f"'{key}.{field}' must be a string")
+
+    # Fusion slots results by source: a mismatch would silently drop one
+    if result.get("source", key) != key:
+        raise ApiError(f"'{key}.source' must be '{key}'")
+
+    confidence = result.get("confidence", 0.7)   # fusion's default
+    if (
+        isinstance(confidence, bool)
+        or not isinstance(confidence, (int, float))
+        or not math.isfinite(confidence)
+    ):
+        raise ApiError(f"'{key}.confidence' must be a number")
+
+    return {**result, "source": key}
+
+
+def check_fusion_inputs(data):
+    return {key: check_engine_result(key, data.get(key)) for key in FUSION_INPUTS}
+
+# =====================================================
+# TEXT
+# =====================================================
+@api_v1.route("/text", methods=["POST"])
+def text():
+    return jsonify(analyze_text(check_text(json_body().get("text"))))
+
+
+@api_v1.route("/text/batch", methods=["POST"])
+def text_batch():
+    texts = [check_text(t) for t in batch_field(json_body(), "texts")]
+    return jsonify({"results": analyze_texts(texts)})
+
+# =====================================================
+# QUESTIONNAIRE
+# =====================================================
+@api_v1.route("/questionnaire", methods=["POST"])
+def questionnaire():
+    answers = check_answers(json_body().get("answers"))
+    return jsonify(analyze_questionnaire(answers))
+
+
+@api_v1.route("/questionnaire/batch", methods=["POST"])
+def questionnaire_batch():
+    answers_list = [check_answers(a) for a in batch_field(json_body(), "answers")]
+    return jsonify({"results": analyze_questionnaires(answers_list)})
+
+# =====================================================
+# FUSION
+# =====================================================
+@api_v1.route("/fuse", methods=["POST"])
+def fuse():
+    inputs = check_fusion_inputs(json_body())
+    with stage("fusion"):
+        result = fuse_results(
+            text_result=inputs["text"],
+            video_result=inputs["video"],
+            questionnaire_result=inputs["questionnaire"]
+        )
+    return jsonify(result)
+
+
+@api_v1.route("/fuse/batch", methods=["POST"])
+def fuse_batch():
+    results = []
+    for item in batch_field(json_body(), "items"):
+        if not isinstance(item, dict):
+            raise ApiError("each item must be an object")
+        inputs = check_fusion_inputs(item)
+        with stage("fusion"):
+            results.append(fuse_results(
+                text_result=inputs["text"],
+                video_result=inputs["video"],
+                questionnaire_result=inputs["questionnaire"]
+            ))
+    return jsonify({"results": results})
@@ -1,6 +1,16 @@
-from flask import Flask, render_template, request, jsonify
+import time
+
+APP_IMPORT_START = time.perf_counter()
+
+from flask import (
+    Flask, Response, render_template, request, jsonify, g, stream_with_context
+)
+import json
 import os
 import sys
+import threading
+import uuid
+from collections import OrderedDict
 
 # =====================================================
 # PATH FIX (PROJECT ROOT)
@@ -13,48 +23,174 @@ if PROJECT_ROOT not in sys.path:
 # IMPORT AI ENGINES
 # =====================================================
 from text_engine.inference import analyze_text
+from text_engine.inference import cache_stats as text_cache_stats
 from questionnaire_engine.inference import analyze_questionnaire
-from fusion_engine.fuse_results import fuse_results
+from questionnaire_engine.inference import cache_stats as questionnaire_cache_stats
+from fusion_engine.fuse_results import SOURCE_ORDER, FusionState
+from model_registry import registry
+from instrumentation import count, render_prometheus, stage
+from flask_app.api import api_v1
+from flask_app.events import broker
+from flask_app.session_store import create_store
 
 # =====================================================
 # APP INIT
 # =====================================================
 app = Flask(__name__)
+app.register_blueprint(api_v1)
+
+# =====================================================
+# MODEL PRELOAD (OPTIONAL)
+# =====================================================
+# Models load lazily on first request by default.
+# PRELOAD_MODELS=all or e.g. "questionnaire_bundle,sentiment_model"
+PRELOAD_MODELS = os.environ.get("PRELOAD_MODELS", "").strip()
+
+if PRELOAD_MODELS:
+    registry.preload(
+        None if PRELOAD_MODELS == "all"
+        else [name.strip() for name in PRELOAD_MODELS.split(",") if name.strip()]
+    )
+
+STARTUP_SECONDS = round(time.perf_counter() - APP_IMPORT_START, 3)
+
+print(f"🚀 Flask app ready in {STARTUP_SECONDS}s")
+print(registry.report())
 
 # =====================================================
-# GLOBAL STATE (SAFE, SIMPLE)
+# PER-SESSION STATE
 # =====================================================
-text_result = None
-questionnaire_result = None
-video_result = None        # comes from Streamlit
-fusion_result = None
+# SESSION_STORE=memory (single worker) or sqlite (shared by workers)
+store = create_store()
+
+SESSION_COOKIE = "mh_session_id"
+VIDEO_ENGINE_URL = os.environ.get("VIDEO_ENGINE_URL", "http://localhost:8501")
+
+EMPTY_RECORD = {
+    "text": None,
+    "questionnaire": None,
+    "video": None,        # comes from Streamlit
+    "fusion": None
+}
+
+# SSE: how long a stream idles before re-checking the shared store,
+# and how long one stream lives before the browser reconnects
+SSE_CHECK_SECONDS = 5
+SSE_MAX_SECONDS = 300
+
+
+def current_session_id():
+    session_id = request.cookies.get(SESSION_COOKIE)
+    if not session_id:
+        session_id = uuid.uuid4().hex
+        g.new_session_id = session_id
+    return session_id
+
+
+def load_record(session_id):
+    # Copy so in-memory records are never mutated in place
+    return dict(store.get(session_id) or EMPTY_RECORD)
+
+
+def save_record(session_id, record):
+    record["version"] = record.get("version", 0) + 1
+    store.set(session_id, record)
+    broker.notify()
+
+
+# Incremental fusion: one FusionState per session in this worker,
+# tagged with the record version it matches. A record changed by
+# another worker (or an evicted state) is fused from scratch.
+FUSION_STATE_MAX = int(os.environ.get("FUSION_STATE_MAX", 1000))
+_fusion_states = OrderedDict()
+_fusion_lock = threading.Lock()
+
+
+def fuse_record(session_id, record, changed=SOURCE_ORDER):
+    """
+    Refresh record["fusion"], re-ingesting only the `changed` modalities
+    when this worker already holds the session's fusion state.
+    """
+    with _fusion_lock:
+        # Popped, so concurrent requests never share one state
+        cached = _fusion_states.pop(session_id, None)
+
+    if cached is not None and cached[0] == record.get("version", 0):
+        state = cached[1]
+        for source in changed:
+            state.remove(source)
+            state.update(record[source])
+    else:
+        state = FusionState(
+            text_result=record["text"],
+            video_result=record["video"],
+            questionnaire_result=record["questionnaire"]
+        )
+
+    record["fusion"] = state.snapshot()
+
+    with _fusion_lock:
+        # save_record() bumps the version right after fusion
+        _fusion_states[session_id] = (record.get("version", 0) + 1, state)
+        while len(_fusion_states) > FUSION_STATE_MAX:
+            _fusion_states.popitem(last=False)
+
+    return record
+
+
+@app.after_request
+def persist_session_cookie(response):
+    session_id = g.pop("new_session_id", None)
+    if session_id:
+        response.set_cookie(
+            SESSION_COOKIE, session_id, httponly=True, samesite="Lax"
+        )
+    return response
 
 # =====================================================
 # API: RECEIVE VIDEO RESULT FROM STREAMLIT
 # =====================================================
 @app.route("/api/video-result", methods=["POST"])
 def receive_video_result():
-    global video_result, fusion_result
+    data = request.get_json(silent=True)
 
-    data = request.get_json()
-
-    if not data:
+    if not data or not isinstance(data, dict):
         return jsonify({
             "status": "error",
             "message": "No JSON received"
         }), 400
 
-    video_result = data
+    # The dashboard hands its session id to the video engine
+    session_id = data.pop("session_id", None) or request.args.get("session_id")
 
-    print("\n📥 Video Result Received:")
-    print(video_result)
+    if not session_id:
+        return jsonify({
+            "status": "error",
+            "message": "session_id required"
+        }), 400
 
-    # Re-run fusion when video arrives
-    fusion_result = fuse_results(
-        text_result=text_result,
-        questionnaire_result=questionnaire_result,
-        video_result=video_result
-    )
+    # Partials arrive every few seconds per running analysis
+    count("video_result_partial" if data.get("partial") else "video_result_final")
+    app.logger.debug("📥 Video result for %s: %s", session_id, data)
+
+    record = load_record(session_id)
+    current = record.get("video") or {}
+
+    # A late partial must not replace the final result of the same run
+    if (
+        data.get("partial")
+        and current.get("run_id") == data.get("run_id")
+        and not current.get("partial")
+    ):
+        return jsonify({
+            "status": "success",
+            "message": "Stale partial ignored"
+        }), 200
+
+    record["video"] = data
+
+    # Re-run fusion when video arrives (partials give a live estimate)
+    save_record(session_id, fuse_record(session_id, record, ("video",)))
 
     return jsonify({
         "status": "success",
@@ -67,11 +203,114 @@ def receive_video_result():
 # =====================================================
 @app.route("/api/status")
 def api_status():
+    record = load_record(current_session_id())
     return jsonify({
-        "text": text_result is not None,
-        "questionnaire": questionnaire_result is not None,
-        "video": video_result is not None,
-        "fusion": fusion_result is not None
+        key: record[key] is not None for key in EMPTY_RECORD
+    })
+
+
+# =====================================================
+# SSE: PUSH RESULT UPDATES TO THE DASHBOARD
+# =====================================================
+def render_cards(session_id, record):
+    """
+    Result cards that can change after the page was rendered.
+    """
+    with stage("template_render"):
+        return {
+            "version": record.get("version", 0),
+            "video": render_template(
+                "partials/video_card.html",
+                video_result=record["video"],
+                session_id=session_id,
+                video_engine_url=VIDEO_ENGINE_URL
+            ),
+            "fusion": render_template(
+                "partials/fusion_card.html",
+                fusion_result=record["fusion"]
+            )
+        }
+
+
+@app.route("/api/events")
+def api_events():
+    session_id = current_session_id()
+
+    # Resume from the version the page (or last event) already showed
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("since")
+    try:
+        seen = int(last_event_id or 0)
+    except ValueError:
+        seen = 0
+
+    def stream():
+        nonlocal seen
+        deadline = time.monotonic() + SSE_MAX_SECONDS
+        generation = broker.generation()
+
+        yield "retry: 3000\n\n"
+
+        while time.monotonic() < deadline:
+            record = load_record(session_id)
+            version = record.get("version", 0)
+
+            if version > seen:
+                seen = version
+                payload = json.dumps(render_cards(session_id, record))
+                yield f"id: {version}\nevent: result\ndata: {payload}\n\n"
+            else:
+                yield ": keep-alive\n\n"
+
+            generation = broker.wait(generation, SSE_CHECK_SECONDS)
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+# =====================================================
+# SESSION STORE STATS
+# =====================================================
+@app.route("/api/session-stats")
+def api_session_stats():
+    return jsonify(store.stats())
+
+
+# =====================================================
+# RESULT CACHE STATS
+# =====================================================
+@app.route("/api/cache-stats")
+def api_cache_stats():
+    return jsonify({
+        "text": text_cache_stats(),
+        "questionnaire": questionnaire_cache_stats()
+    })
+
+
+# =====================================================
+# PROMETHEUS METRICS (PER WORKER PROCESS)
+# =====================================================
+@app.route("/metrics")
+def metrics():
+    return Response(
+        render_prometheus(),
+        mimetype="text/plain; version=0.0.4"
+    )
+
+
+# =====================================================
+# STARTUP TIMING REPORT
+# =====================================================
+@app.route("/api/startup")
+def api_startup():
+    return jsonify({
+        "startup_seconds": STARTUP_SECONDS,
+        **registry.report()
     })
 
 
@@ -80,13 +319,17 @@ def api_status():
 # =====================================================
 @app.route("/", methods=["GET", "POST"])
 def index():
-    global text_result, questionnaire_result, fusion_result
+    session_id = current_session_id()
+    record = load_record(session_id)
 
     if request.method == "POST":
 
         # ================= TEXT ANALYSIS =================
+        changed = []
+
         if "text" in request.form and request.form["text"].strip():
-            text_result = analyze_text(request.form["text"])
+            record["text"] = analyze_text(request.form["text"])
+            changed.append("text")
 
         # ================= QUESTIONNAIRE =================
         questionnaire_keys = [k for k in request.form if k.startswith("Q")]
@@ -99,24 +342,25 @@ def index():
             }
 
             if questionnaire_answers:
-                questionnaire_result = analyze_questionnaire(
+                record["questionnaire"] = analyze_questionnaire(
                     questionnaire_answers
                 )
+                changed.append("questionnaire")
 
         # ================= FUSION =================
-        fusion_result = fuse_results(
-            text_result=text_result,
-            questionnaire_result=questionnaire_result,
-            video_result=video_result
-        )
+        save_record(session_id, fuse_record(session_id, record, changed))
 
-    return render_template(
-        "index.html",
-        text_result=text_result,
-        questionnaire_result=questionnaire_result,
-        video_result=video_result,
-        fusion_result=fusion_result
-    )
+    with stage("template_render"):
+        return render_template(
+            "index.html",
+            text_result=record["text"],
+            questionnaire_result=record["questionnaire"],
+            video_result=record["video"],
+            fusion_result=record["fusion"],
+            session_id=session_id,
+            video_engine_url=VIDEO_ENGINE_URL,
+            result_version=record.get("version", 0)
+        )
 
 
 # =====================================================
@@ -0,0 +1,39 @@
+import threading
+
+# =====================================================
+# RESULT UPDATE BROKER
+# =====================================================
+class ResultBroker:
+    """
+    Wakes Server-Sent Event streams when a session record changes.
+
+    Streams block in `wait()` instead of clients polling over HTTP.
+    A notify only reaches streams in the same worker, so streams also
+    re-check the (shared) store after each timeout; that covers
+    updates landing on another gunicorn worker.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._generation = 0
+
+    def notify(self):
+        with self._cond:
+            self._generation += 1
+            self._cond.notify_all()
+
+    def generation(self) -> int:
+        with self._cond:
+            return self._generation
+
+    def wait(self, since: int, timeout: float) -> int:
+        """
+        Block until a notify after generation `since` or timeout.
+        Returns the current generation.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._generation != since, timeout)
+            return self._generation
+
+
+broker = ResultBroker()
@@ -0,0 +1,37 @@
+import os
+
+# =====================================================
+# GUNICORN CONFIG
+# =====================================================
+# cd flask_app && gunicorn -c gunicorn.conf.py app:app
+#
+# Threaded workers: TF/XGBoost release the GIL during predict, and
+# concurrent analyze_text() calls in one worker are coalesced by the
+# text micro-batcher.
+#
+# SSE capacity: every open dashboard holds one thread for its
+# /api/events stream (up to SSE_MAX_SECONDS = 300s, then the browser
+# reconnects). With WEB_CONCURRENCY × GUNICORN_THREADS = 2 × 8 = 16
+# threads, 16 open dashboards leave none for normal requests and the
+# server appears to hang. Size GUNICORN_THREADS for
+# (open dashboards per worker) + (concurrent requests per worker).
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+# Models load lazily, once per worker, after fork (TensorFlow is not
+# fork-safe), so a worker only pays for the engines it serves.
+# Opt in to loading at worker boot instead of on the first request:
+#   PRELOAD_MODELS=all  or e.g.  PRELOAD_MODELS=questionnaire_bundle
+preload_app = False
+
+# Several workers only see each other's sessions through SQLite
+if workers > 1:
+    os.environ.setdefault("SESSION_STORE", "sqlite")
@@ -0,0 +1,231 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# =====================================================
+# CONFIG
+# =====================================================
+# SESSION_STORE=memory (per worker) | sqlite (shared across workers)
+STORE_BACKEND = os.environ.get("SESSION_STORE", "memory")
+STORE_PATH = os.environ.get(
+    "SESSION_DB_PATH",
+    os.path.join(os.path.dirname(__file__), "sessions.sqlite3")
+)
+MAX_SESSIONS = int(os.environ.get("SESSION_MAX", 10000))
+SESSION_TTL_SECONDS = float(os.environ.get("SESSION_TTL", 6 * 3600))
+
+# =====================================================
+# BASE STORE
+# =====================================================
+class SessionStore(ABC):
+    """
+    Per-session result records keyed by session id.
+
+    A record is a JSON-safe dict, e.g.
+    {"text": ..., "questionnaire": ..., "video": ..., "fusion": ...}
+    """
+
+    def __init__(self, max_sessions: int, ttl_seconds: Optional[float]):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self._counter_lock = threading.Lock()
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def set(self, session_id: str, record: Dict):
+        ...
+
+    @abstractmethod
+    def __len__(self):
+        ...
+
+    def stats(self) -> Dict:
+        with self._counter_lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "backend": type(self).__name__,
+            "sessions": len(self),
+            "max_sessions": self.max_sessions,
+            "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            **counters
+        }
+
+    def _count(self, name: str, n: int = 1):
+        if n:
+            with self._counter_lock:
+                self._counters[name] += n
+
+    def _expired(self, updated_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - updated_at > self.ttl_seconds
+
+# =====================================================
+# IN-MEMORY LRU + TTL
+# =====================================================
+class MemorySessionStore(SessionStore):
+    """
+    Bounded LRU with TTL. Fast, but private to one worker process.
+    """
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, ttl_seconds: Optional[float] = SESSION_TTL_SECONDS):
+        super().__init__(max_sessions, ttl_seconds)
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(session_id)
+            if entry is None:
+                self._count("misses")
+                return None
+
+            updated_at, record = entry
+            if self._expired(updated_at, now):
+                del self._data[session_id]
+                self._count("expirations")
+                self._count("misses")
+                return None
+
+            self._data.move_to_end(session_id)
+            self._count("hits")
+            return record
+
+    def set(self, session_id, record):
+        with self._lock:
+            self._data[session_id] = (time.time(), record)
+            self._data.move_to_end(session_id)
+
+            while len(self._data) > self.max_sessions:
+                self._data.popitem(last=False)
+                self._count("evictions")
+
+    def __len__(self):
+        return len(self._data)
+
+# =====================================================
+# SQLITE (SHARED BY ALL LOCAL WORKERS)
+# =====================================================
+class SQLiteSessionStore(SessionStore):
+    """
+    Local SQLite file in WAL mode, so every gunicorn worker on the
+    host sees the same sessions. LRU order follows `accessed_at`,
+    which reads only refresh once it is `touch_seconds` old (default
+    TTL/10), so polling readers such as SSE streams don't write.
+    """
+
+    def __init__(
+        self,
+        path: str = STORE_PATH,
+        max_sessions: int = MAX_SESSIONS,
+        ttl_seconds: Optional[float] = SESSION_TTL_SECONDS,
+        touch_seconds: Optional[float] = None
+    ):
+        super().__init__(max_sessions, ttl_seconds)
+        self.path = path
+        if touch_seconds is None:
+            touch_seconds = ttl_seconds / 10 if ttl_seconds else 60.0
+        self.touch_seconds = touch_seconds
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " id TEXT PRIMARY KEY,"
+            " record TEXT NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS sessions_accessed ON sessions(accessed_at)"
+        )
+        conn.commit()
+
+    def _conn(self):
+        # One connection per thread (and per forked worker)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, session_id):
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT record, updated_at, accessed_at FROM sessions WHERE id = ?",
+            (session_id,)
+        ).fetchone()
+
+        if row is None:
+            self._count("misses")
+            return None
+
+        record, updated_at, accessed_at = row
+        if self._expired(updated_at, now):
+            with conn:
+                conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            self._count("expirations")
+            self._count("misses")
+            return None
+
+        if now - accessed_at >= self.touch_seconds:
+            with conn:
+                conn.execute(
+                    "UPDATE sessions SET accessed_at = ? WHERE id = ?",
+                    (now, session_id)
+                )
+        self._count("hits")
+        return json.loads(record)
+
+    def set(self, session_id, record):
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO sessions (id, record, updated_at, accessed_at) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET record = excluded.record, "
+                "updated_at = excluded.updated_at, accessed_at = excluded.accessed_at",
+                (session_id, json.dumps(record), now, now)
+            )
+
+            if self.ttl_seconds is not None:
+                expired = conn.execute(
+                    "DELETE FROM sessions WHERE updated_at < ?",
+                    (now - self.ttl_seconds,)
+                ).rowcount
+                self._count("expirations", expired)
+
+            evicted = conn.execute(
+                "DELETE FROM sessions WHERE id IN ("
+                " SELECT id FROM sessions ORDER BY accessed_at DESC"
+                " LIMIT -1 OFFSET ?)",
+                (self.max_sessions,)
+            ).rowcount
+            self._count("evictions", evicted)
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+# =====================================================
+# FACTORY
+# =====================================================
+def create_store(backend: str = STORE_BACKEND) -> SessionStore:
+    if backend == "sqlite":
+        return SQLiteSessionStore()
+    if backend == "memory":
+        return MemorySessionStore()
+    raise ValueError(f"Unknown SESSION_STORE backend '{backend}'")
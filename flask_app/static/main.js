@@ -1,6 +1,6 @@
 /* =========================================================
    AI Mental Health Analyzer — Frontend Logic
-   Auto-refresh when Streamlit sends video result
+   Live result cards pushed by the server (SSE)
 ========================================================= */
 
 /* =========================
@@ -12,36 +12,41 @@ function showTextLoader() {
 }
 
 /* =========================
-   POLL FLASK FOR VIDEO RESULT
+   PATCH RESULT CARDS IN PLACE
 ========================= */
-function pollForVideoResult() {
-    fetch("/api/status")
-        .then(res => res.json())
-        .then(data => {
-            if (data.has_video) {
-                console.log("✅ Video result detected — refreshing UI");
-                window.location.reload();
-            } else {
-                // Retry after 2 seconds
-                setTimeout(pollForVideoResult, 2000);
-            }
-        })
-        .catch(err => {
-            console.warn("⚠ Status check failed, retrying...", err);
-            setTimeout(pollForVideoResult, 3000);
-        });
+function patchCard(id, html) {
+    const card = document.getElementById(id);
+    if (card && typeof html === "string") card.innerHTML = html;
 }
 
 /* =========================
-   START POLLING ON PAGE LOAD
+   SUBSCRIBE TO RESULT EVENTS
+   (no polling — the server pushes when video/fusion change)
+========================= */
+function subscribeToResults() {
+    if (!window.EventSource) return;
+
+    const since = document.body.dataset.resultVersion || "0";
+    const source = new EventSource(`/api/events?since=${since}`);
+
+    source.addEventListener("result", event => {
+        const data = JSON.parse(event.data);
+        console.log("✅ Result update received — patching cards");
+        patchCard("video-card", data.video);
+        patchCard("fusion-card", data.fusion);
+        document.body.dataset.resultVersion = data.version;
+    });
+
+    // EventSource reconnects by itself (resuming via Last-Event-ID)
+    source.onerror = () => console.warn("⚠ Result stream interrupted, reconnecting...");
+}
+
+/* =========================
+   START ON PAGE LOAD
 ========================= */
 window.addEventListener("load", () => {
     const textLoader = document.getElementById("textLoader");
     if (textLoader) textLoader.style.display = "none";
 
-    // Only poll if video result is not already visible
-    const videoSection = document.querySelector(".video-result");
-    if (!videoSection) {
-        pollForVideoResult();
-    }
+    subscribeToResults();
 });
@@ -0,0 +1,216 @@
+import argparse
+import random
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from fusion_engine.fuse_results import (
+    RISK_MAP,
+    SOURCE_ORDER,
+    WEIGHTS,
+    FusionState,
+    fuse_results,
+)
+
+RISK_LABELS = np.array(["Unknown", "Low", "Moderate", "High"], dtype=object)
+CONFIDENCE_LABELS = np.array(["Strong", "Moderate", "Weak"], dtype=object)
+
+# =====================================================
+# EXACT ROUNDING
+# =====================================================
+def round2(x: np.ndarray) -> np.ndarray:
+    """
+    Vectorized round(x, 2) with Python's exact semantics.
+
+    np.round scales by 100 first, which can land on the wrong side of
+    a .5 tie; the (rare) near-tie values are re-rounded in Python.
+    """
+    out = np.round(x, 2)
+
+    scaled = x * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        out[near_tie] = [round(float(v), 2) for v in x[near_tie]]
+
+    return out
+
+# =====================================================
+# VECTORIZED FUSION
+# =====================================================
+def fuse_batch(
+    risk: Dict[str, np.ndarray],
+    confidence: Dict[str, np.ndarray],
+    present: Optional[Dict[str, np.ndarray]] = None,
+    as_frame: bool = False
+):
+    """
+    fuse_results() over columnar inputs, one row per assessment.
+
+    risk:       source → int risk codes (RISK_MAP values, 0 = missing)
+    confidence: source → float confidences (use 0.7 where unknown)
+    present:    source → bool mask (default: risk code > 0)
+
+    Returns a dict of arrays (or a pandas DataFrame with as_frame=True)
+    with weighted_avg, risk_level, confidence_label, confidence_score
+    and medical_recommendation, numerically identical to fuse_results.
+    """
+    sources = [s for s in SOURCE_ORDER if s in risk]
+    n = len(risk[sources[0]]) if sources else 0
+
+    codes = {s: np.asarray(risk[s], dtype=np.int64) for s in sources}
+    confs = {s: np.asarray(confidence[s], dtype=np.float64) for s in sources}
+    masks = {
+        s: (np.asarray(present[s], dtype=bool) if present and s in present
+            else codes[s] > 0) & np.isin(codes[s], list(RISK_MAP.values()))
+        for s in sources
+    }
+
+    # Accumulate in canonical order, like the scalar left-to-right sums
+    weighted_sum = np.zeros(n)
+    weight_sum = np.zeros(n)
+    conf_sum = np.zeros(n)
+    count = np.zeros(n, dtype=np.int64)
+    high = np.zeros(n, dtype=np.int64)
+    lo = np.full(n, 99, dtype=np.int64)
+    hi = np.zeros(n, dtype=np.int64)
+
+    for s in sources:
+        m = masks[s]
+        c = codes[s]
+        weighted_sum = weighted_sum + np.where(m, c * WEIGHTS[s], 0.0)
+        weight_sum = weight_sum + np.where(m, WEIGHTS[s], 0.0)
+        conf_sum = conf_sum + np.where(m, confs[s], 0.0)
+        count += m
+        high += m & (c == RISK_MAP["High"])
+        lo = np.where(m, np.minimum(lo, c), lo)
+        hi = np.where(m, np.maximum(hi, c), hi)
+
+    any_present = count > 0
+    safe_count = np.maximum(count, 1)
+
+    weighted_avg = round2(weighted_sum / np.where(any_present, weight_sum, 1.0))
+    confidence_score = np.where(any_present, round2(conf_sum / safe_count), 0.0)
+
+    risk_code = np.where(
+        weighted_avg >= 2.5, 3, np.where(weighted_avg >= 1.7, 2, 1)
+    )
+    risk_code = np.where(any_present, risk_code, 0)
+
+    agreement_range = np.clip(hi - lo, 0, 2)
+    label_code = np.where(any_present, agreement_range, 2)
+
+    questionnaire = masks.get("questionnaire", np.zeros(n, dtype=bool))
+    medical = any_present & (
+        (high >= 2) | ((risk_code == 3) & questionnaire)
+    )
+
+    result = {
+        "weighted_avg": np.where(any_present, weighted_avg, np.nan),
+        "risk_level": RISK_LABELS[risk_code],
+        "confidence_label": CONFIDENCE_LABELS[label_code],
+        "confidence_score": confidence_score,
+        "medical_recommendation": medical
+    }
+
+    if as_frame:
+        import pandas as pd
+        return pd.DataFrame(result)
+    return result
+
+# =====================================================
+# ROW RESULTS → COLUMNS
+# =====================================================
+def columns_from_results(
+    triples: Iterable[Tuple[Optional[Dict], Optional[Dict], Optional[Dict]]]
+):
+    """
+    Convert (text, video, questionnaire) result dicts into fuse_batch inputs.
+    """
+    triples = list(triples)
+    risk = {s: np.zeros(len(triples), dtype=np.int64) for s in SOURCE_ORDER}
+    confidence = {s: np.full(len(triples), 0.7) for s in SOURCE_ORDER}
+
+    for i, triple in enumerate(triples):
+        for result in triple:
+            if not result or result.get("source") not in WEIGHTS:
+                continue
+            source = result["source"]
+            risk[source][i] = RISK_MAP.get(result.get("risk_level"), 0)
+            confidence[source][i] = float(result.get("confidence", 0.7))
+
+    return risk, confidence
+
+# =====================================================
+# RANDOMIZED EQUIVALENCE CHECK
+# =====================================================
+def _random_result(rng: random.Random, source: str):
+    if rng.random() < 0.25:
+        return None
+
+    result = {
+        "source": source,
+        "risk_level": rng.choice(["Low", "Moderate", "High", "Unknown"])
+    }
+
+    if rng.random() < 0.9:
+        # Include 2-decimal values and exact .xx5 ties
+        result["confidence"] = rng.choice([
+            rng.random(),
+            round(rng.random(), 2),
+            rng.randrange(1000) / 1000,
+            rng.randrange(200) / 200
+        ])
+    return result
+
+
+def verify(n: int = 100000, seed: int = 0) -> int:
+    """
+    Property check: fuse_batch agrees with fuse_results on random rows.
+    """
+    rng = random.Random(seed)
+    triples = [
+        tuple(_random_result(rng, s) for s in SOURCE_ORDER)
+        for _ in range(n)
+    ]
+
+    batch = fuse_batch(*columns_from_results(triples))
+
+    for i, (text, video, questionnaire) in enumerate(triples):
+        expected = fuse_results(
+            text_result=text,
+            video_result=video,
+            questionnaire_result=questionnaire
+        )
+        weighted_avg = FusionState(text, video, questionnaire).weighted_average()
+        batch_avg = float(batch["weighted_avg"][i])
+
+        actual = (
+            None if np.isnan(batch_avg) else batch_avg,
+            batch["risk_level"][i],
+            batch["confidence_label"][i],
+            float(batch["confidence_score"][i]),
+            bool(batch["medical_recommendation"][i])
+        )
+        assert actual == (
+            weighted_avg,
+            expected["risk_level"],
+            expected["confidence"]["label"],
+            expected["confidence"]["score"],
+            expected["medical_recommendation"]
+        ), f"row {i} differs: {actual} vs {expected}"
+
+    return n
+
+# =====================================================
+# CLI
+# =====================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check fuse_batch against fuse_results."
+    )
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = verify(args.rows, args.seed)
+    print(f"✅ fuse_batch matches fuse_results on {rows} random rows")
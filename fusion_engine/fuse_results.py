@@ -1,4 +1,6 @@
-from typing import Dict, Optional, List
+from typing import Dict, Optional
+
+from instrumentation import stage
 
 # =====================================================
 # RISK NORMALIZATION
@@ -18,83 +20,72 @@ WEIGHTS = {
     "questionnaire": 0.5
 }
 
+# Canonical ingest order (matches fuse_results argument order)
+SOURCE_ORDER = ("text", "video", "questionnaire")
+
+INSUFFICIENT_DATA = {
+    "source": "fusion",
+    "risk_level": "Unknown",
+    "confidence": {
+        "label": "Weak",
+        "score": 0.0
+    },
+    "signals": {},
+    "explanation": "Insufficient multimodal data for assessment.",
+    "medical_recommendation": False
+}
+
 # =====================================================
-# FUSION FUNCTION (WEIGHTED + STANDARDIZED)
+# CORE FUSION (SHARED BY BOTH PATHS)
 # =====================================================
-def fuse_results(
-    text_result: Optional[Dict] = None,
-    video_result: Optional[Dict] = None,
-    questionnaire_result: Optional[Dict] = None
-) -> Dict:
+def _fuse(slots: Dict[str, tuple]) -> Dict:
     """
-    Weighted multimodal fusion for mental health risk assessment.
+    Fused result from per-source (risk, confidence) slots.
 
-    Expected input schema (each engine):
-    {
-        "source": "text | video | questionnaire",
-        "risk_level": "Low | Moderate | High",
-        "confidence": float (0–1),
-        "signals": {...},
-        "explanation": str
-    }
+    Sums run in SOURCE_ORDER so full and incremental fusion (and
+    fusion_engine.batch) round identically.
     """
-
-    weighted_scores: List[float] = []
+    weighted_sum = 0.0
+    weight_sum = 0.0
+    confidence_sum = 0.0
     source_risks: Dict[str, str] = {}
-    confidences: List[float] = []
-
-    # =====================================================
-    # INGEST FUNCTION
-    # =====================================================
-    def ingest(result: Optional[Dict]):
-        if not result:
-            return
+    lowest, highest, high_sources = 3, 1, 0
 
-        source = result.get("source")
-        risk = result.get("risk_level")
-        confidence = float(result.get("confidence", 0.7))
+    for source in SOURCE_ORDER:
+        slot = slots.get(source)
+        if slot is None:
+            continue
 
-        if source not in WEIGHTS:
-            return
-        if risk not in RISK_MAP:
-            return
-
-        weight = WEIGHTS[source]
+        risk, confidence = slot
         numeric_risk = RISK_MAP[risk]
+        weight = WEIGHTS[source]
 
-        weighted_scores.append(numeric_risk * weight)
+        weighted_sum += numeric_risk * weight
+        weight_sum += weight
+        confidence_sum += confidence
         source_risks[source] = risk
-        confidences.append(confidence)
 
-    # =====================================================
-    # INGEST ALL SOURCES
-    # =====================================================
-    ingest(text_result)
-    ingest(video_result)
-    ingest(questionnaire_result)
+        if numeric_risk < lowest:
+            lowest = numeric_risk
+        if numeric_risk > highest:
+            highest = numeric_risk
+        if numeric_risk == 3:
+            high_sources += 1
 
     # =====================================================
     # SAFETY CHECK
     # =====================================================
-    if not weighted_scores:
+    if not source_risks:
         return {
-            "source": "fusion",
-            "risk_level": "Unknown",
-            "confidence": {
-                "label": "Weak",
-                "score": 0.0
-            },
-            "signals": {},
-            "explanation": "Insufficient multimodal data for assessment.",
-            "medical_recommendation": False
+            **INSUFFICIENT_DATA,
+            "confidence": dict(INSUFFICIENT_DATA["confidence"]),
+            "signals": {}
         }
 
     # =====================================================
     # WEIGHTED FUSION LOGIC
     # =====================================================
-    weighted_avg = round(sum(weighted_scores) / sum(
-        WEIGHTS[s] for s in source_risks
-    ), 2)
+    weighted_avg = round(weighted_sum / weight_sum, 2)
 
     if weighted_avg >= 2.5:
         final_risk = "High"
@@ -106,10 +97,9 @@ def fuse_results(
     # =====================================================
     # CONFIDENCE LOGIC
     # =====================================================
-    agreement_range = max(RISK_MAP[r] for r in source_risks.values()) - \
-                      min(RISK_MAP[r] for r in source_risks.values())
+    agreement_range = highest - lowest
 
-    avg_confidence = round(sum(confidences) / len(confidences), 2)
+    avg_confidence = round(confidence_sum / len(source_risks), 2)
 
     if agreement_range == 0:
         confidence_label = "Strong"
@@ -121,10 +111,6 @@ def fuse_results(
     # =====================================================
     # MEDICAL ESCALATION (ETHICAL)
     # =====================================================
-    high_sources = sum(
-        1 for r in source_risks.values() if r == "High"
-    )
-
     medical_recommendation = (
         high_sources >= 2 or
         (final_risk == "High" and "questionnaire" in source_risks)
@@ -147,3 +133,122 @@ def fuse_results(
         ),
         "medical_recommendation": medical_recommendation
     }
+
+
+def _ingest(slots: Dict[str, tuple], result: Optional[Dict]) -> bool:
+    """
+    Put one engine result into its source's slot. A known source with
+    an unknown risk_level clears that slot. Returns True on change.
+    """
+    if not result:
+        return False
+
+    source = result.get("source")
+    risk = result.get("risk_level")
+    confidence = float(result.get("confidence", 0.7))
+
+    if source not in WEIGHTS:
+        return False
+    if risk not in RISK_MAP:
+        return slots.pop(source, None) is not None
+
+    slots[source] = (risk, confidence)
+    return True
+
+# =====================================================
+# INCREMENTAL FUSION STATE
+# =====================================================
+class FusionState:
+    """
+    Stateful fusion that accepts one modality update at a time.
+
+    Keeps the per-source slots between updates and memoizes the fused
+    result, so repeated snapshots are free and an update only touches
+    its own slot. Output is identical to fuse_results().
+    """
+
+    def __init__(
+        self,
+        text_result: Optional[Dict] = None,
+        video_result: Optional[Dict] = None,
+        questionnaire_result: Optional[Dict] = None
+    ):
+        # source → (risk, confidence)
+        self._slots: Dict[str, tuple] = {}
+        self._snapshot: Optional[Dict] = None
+
+        for result in (text_result, video_result, questionnaire_result):
+            _ingest(self._slots, result)
+
+    # =================================================
+    # UPDATES
+    # =================================================
+    def update(self, result: Optional[Dict]) -> bool:
+        """
+        Ingest (or replace) one modality result. A result for a known
+        source with an invalid risk_level removes that source, as
+        fuse_results() would ignore it. Returns True if state changed.
+        """
+        changed = _ingest(self._slots, result)
+        if changed:
+            self._snapshot = None
+        return changed
+
+    def remove(self, source: str):
+        if self._slots.pop(source, None) is not None:
+            self._snapshot = None
+
+    # =================================================
+    # OUTPUT
+    # =================================================
+    def snapshot(self) -> Dict:
+        """
+        Current fused result (standardized schema), memoized until
+        the next update.
+        """
+        if self._snapshot is None:
+            with stage("fusion"):
+                self._snapshot = _fuse(self._slots)
+
+        result = dict(self._snapshot)
+        result["confidence"] = dict(result["confidence"])
+        result["signals"] = dict(result["signals"])
+        return result
+
+    def weighted_average(self) -> Optional[float]:
+        """
+        Weighted mean risk (rounded to 2 dp), None without data.
+        """
+        slots = [(s, self._slots[s]) for s in SOURCE_ORDER if s in self._slots]
+        if not slots:
+            return None
+
+        return round(sum(RISK_MAP[slot[0]] * WEIGHTS[s] for s, slot in slots) / sum(
+            WEIGHTS[s] for s, _ in slots
+        ), 2)
+
+# =====================================================
+# FUSION FUNCTION (WEIGHTED + STANDARDIZED)
+# =====================================================
+def fuse_results(
+    text_result: Optional[Dict] = None,
+    video_result: Optional[Dict] = None,
+    questionnaire_result: Optional[Dict] = None
+) -> Dict:
+    """
+    Weighted multimodal fusion for mental health risk assessment.
+
+    Expected input schema (each engine):
+    {
+        "source": "text | video | questionnaire",
+        "risk_level": "Low | Moderate | High",
+        "confidence": float (0–1),
+        "signals": {...},
+        "explanation": str
+    }
+    """
+    slots: Dict[str, tuple] = {}
+    _ingest(slots, text_result)
+    _ingest(slots, video_result)
+    _ingest(slots, questionnaire_result)
+    return _fuse(slots)
@@ -0,0 +1,27 @@
+from instrumentation.timing import (
+    Histogram,
+    count,
+    counters,
+    enable,
+    is_enabled,
+    observe,
+    render_prometheus,
+    reset,
+    stage,
+    summary,
+    timed,
+)
+
+__all__ = [
+    "Histogram",
+    "count",
+    "counters",
+    "enable",
+    "is_enabled",
+    "observe",
+    "render_prometheus",
+    "reset",
+    "stage",
+    "summary",
+    "timed",
+]
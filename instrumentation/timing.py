@@ -0,0 +1,225 @@
+import bisect
+import functools
+import os
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+# =====================================================
+# CONFIG
+# =====================================================
+# METRICS_ENABLED=0 turns every stage() / timed() into a no-op
+ENABLED = os.environ.get("METRICS_ENABLED", "1").lower() not in ("0", "false", "no")
+
+# Seconds; covers ~10µs fusion up to multi-second model loads
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+METRIC_NAME = "mh_stage_seconds"
+COUNTER_NAME = "mh_events_total"
+
+# =====================================================
+# HISTOGRAM
+# =====================================================
+class Histogram:
+    """
+    Fixed-bucket latency histogram (Prometheus semantics: cumulative
+    `le` buckets on export, +Inf implied).
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate from buckets (linear within the bucket), like
+        Prometheus histogram_quantile.
+        """
+        with self._lock:
+            counts, count = list(self.counts), self.count
+        if not count:
+            return None
+
+        rank = q * count
+        seen = 0
+        for i, n in enumerate(counts):
+            if seen + n >= rank and n:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                if i == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+# =====================================================
+# STAGE REGISTRY
+# =====================================================
+_histograms: Dict[str, Histogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def histogram(name: str) -> Histogram:
+    h = _histograms.get(name)
+    if h is None:
+        with _histograms_lock:
+            h = _histograms.setdefault(name, Histogram())
+    return h
+
+
+def observe(name: str, seconds: float):
+    if ENABLED:
+        histogram(name).observe(seconds)
+
+
+def enable(flag: bool = True):
+    global ENABLED
+    ENABLED = flag
+
+
+def is_enabled() -> bool:
+    return ENABLED
+
+
+def reset():
+    with _histograms_lock:
+        _histograms.clear()
+        _counters.clear()
+
+# =====================================================
+# EVENT COUNTERS
+# =====================================================
+_counters: Dict[str, int] = {}
+
+
+def count(name: str, amount: int = 1):
+    """
+    Bump an event counter:  count("video_result_partial")
+    """
+    if ENABLED:
+        with _histograms_lock:
+            _counters[name] = _counters.get(name, 0) + amount
+
+
+def counters() -> Dict[str, int]:
+    with _histograms_lock:
+        return dict(sorted(_counters.items()))
+
+# =====================================================
+# CONTEXT MANAGER / DECORATOR
+# =====================================================
+class _NoopStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        histogram(self.name).observe(time.perf_counter() - self.start)
+        return False
+
+
+_NOOP = _NoopStage()
+
+
+def stage(name: str):
+    """
+    Time a block:  with stage("tokenize"): ...
+    Costs one global lookup when metrics are disabled.
+    """
+    return _Stage(name) if ENABLED else _NOOP
+
+
+def timed(name: str):
+    """
+    Decorator form of stage().
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram(name).observe(time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+# =====================================================
+# EXPORT
+# =====================================================
+def summary() -> Dict[str, Dict]:
+    """
+    Per-stage count, mean and estimated p50/p95 in milliseconds.
+    """
+    out = {}
+    for name, h in sorted(_histograms.items()):
+        if not h.count:
+            continue
+        out[name] = {
+            "count": h.count,
+            "mean_ms": round(h.sum / h.count * 1000, 3),
+            "p50_ms": round(h.quantile(0.5) * 1000, 3),
+            "p95_ms": round(h.quantile(0.95) * 1000, 3),
+        }
+    return out
+
+
+def render_prometheus() -> str:
+    """
+    Prometheus text exposition of every stage histogram and event
+    counter.
+    """
+    lines = [
+        f"# HELP {METRIC_NAME} Time spent per inference stage.",
+        f"# TYPE {METRIC_NAME} histogram",
+    ]
+    for name, h in sorted(_histograms.items()):
+        with h._lock:
+            counts, count, total = list(h.counts), h.count, h.sum
+
+        cumulative = 0
+        for le, n in zip(h.buckets, counts):
+            cumulative += n
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+        lines.append(f'{METRIC_NAME}_bucket{{stage="{name}",le="+Inf"}} {count}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{name}"}} {total}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{name}"}} {count}')
+
+    lines += [
+        f"# HELP {COUNTER_NAME} Events seen per kind.",
+        f"# TYPE {COUNTER_NAME} counter",
+    ]
+    for name, n in counters().items():
+        lines.append(f'{COUNTER_NAME}{{event="{name}"}} {n}')
+
+    return "\n".join(lines) + "\n"
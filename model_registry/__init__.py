@@ -0,0 +1,8 @@
+from model_registry.registry import (
+    ModelRegistry,
+    current_rss_mb,
+    peak_rss_mb,
+    registry,
+)
+
+__all__ = ["ModelRegistry", "current_rss_mb", "peak_rss_mb", "registry"]
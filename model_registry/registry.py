@@ -0,0 +1,173 @@
+import itertools
+import os
+import resource
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# =====================================================
+# MEMORY HELPERS
+# =====================================================
+def current_rss_mb() -> float:
+    """
+    Resident set size of this process in MB (Linux /proc, else peak).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+# =====================================================
+# MODEL ENTRY
+# =====================================================
+# Process-wide, so no two loads ever share a generation
+_generations = itertools.count(1)
+
+
+class _Entry:
+    def __init__(self, loader: Callable[[], Any], warmup: Optional[Callable[[Any], None]]):
+        self.loader = loader
+        self.warmup = warmup
+        self.instance = None
+        self.loaded = False
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.stats: Dict[str, float] = {}
+
+# =====================================================
+# REGISTRY
+# =====================================================
+class ModelRegistry:
+    """
+    Process-wide registry of lazily loaded models.
+
+    Engines register a loader (and optional warm-up hook) at import
+    time; nothing heavy is imported until the first `get()`, and each
+    model is instantiated at most once per process.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        warmup: Optional[Callable[[Any], None]] = None
+    ):
+        with self._lock:
+            # Re-registration (module reload) keeps a loaded instance
+            if name in self._entries:
+                entry = self._entries[name]
+                entry.loader = loader
+                entry.warmup = warmup
+                return
+            self._entries[name] = _Entry(loader, warmup)
+
+    def get(self, name: str):
+        entry = self._entry(name)
+        if entry.loaded:
+            return entry.instance
+
+        with entry.lock:
+            if not entry.loaded:
+                self._load(name, entry, warmup=False)
+        return entry.instance
+
+    def preload(self, names: Optional[Iterable[str]] = None, warmup: bool = True):
+        """
+        Eagerly load (and warm up) the given models, or all registered.
+        """
+        for name in (list(names) if names is not None else self.names()):
+            entry = self._entry(name)
+            with entry.lock:
+                if not entry.loaded:
+                    self._load(name, entry, warmup=warmup)
+                elif warmup and "warmup_seconds" not in entry.stats:
+                    self._warmup(entry)
+
+    def override(self, name: str, instance: Any):
+        """
+        Install a ready-made instance (stand-in models, tests, benchmarks).
+        """
+        if name not in self._entries:
+            self.register(name, lambda: instance)
+
+        entry = self._entry(name)
+        with entry.lock:
+            entry.instance = instance
+            entry.loaded = True
+            entry.generation = next(_generations)
+            entry.stats = {"load_seconds": 0.0, "rss_delta_mb": 0.0}
+
+    def generation(self, name: str) -> int:
+        """
+        Changes whenever the instance is loaded or overridden, so result
+        caches can key on it and never serve another model's output.
+        """
+        return self._entry(name).generation
+
+    def is_loaded(self, name: str) -> bool:
+        entry = self._entries.get(name)
+        return bool(entry and entry.loaded)
+
+    def names(self):
+        return sorted(self._entries)
+
+    def report(self) -> Dict[str, Dict]:
+        """
+        Startup-timing report: load/warm-up seconds and RSS growth per model.
+        """
+        models = {
+            name: {"loaded": entry.loaded, **entry.stats}
+            for name, entry in sorted(self._entries.items())
+        }
+        return {
+            "models": models,
+            "rss_mb": round(current_rss_mb(), 1),
+            "peak_rss_mb": round(peak_rss_mb(), 1)
+        }
+
+    # =================================================
+    # INTERNALS
+    # =================================================
+    def _entry(self, name: str) -> _Entry:
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise KeyError(f"Unknown model '{name}'") from None
+
+    def _load(self, name: str, entry: _Entry, warmup: bool):
+        rss_before = current_rss_mb()
+        start = time.perf_counter()
+
+        instance = entry.loader()
+
+        entry.stats["load_seconds"] = round(time.perf_counter() - start, 3)
+        entry.instance = instance
+        entry.loaded = True
+        entry.generation = next(_generations)
+
+        if warmup:
+            self._warmup(entry)
+
+        entry.stats["rss_delta_mb"] = round(current_rss_mb() - rss_before, 1)
+        print(f"🧠 Model loaded: {name} ({entry.stats['load_seconds']}s)")
+
+    def _warmup(self, entry: _Entry):
+        if entry.warmup is None:
+            return
+        start = time.perf_counter()
+        entry.warmup(entry.instance)
+        entry.stats["warmup_seconds"] = round(time.perf_counter() - start, 3)
+
+
+registry = ModelRegistry()
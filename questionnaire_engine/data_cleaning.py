@@ -1,64 +1,335 @@
-import pandas as pd
+import argparse
+import json
 import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
 
 # =====================================================
 # PATH SAFE LOAD
 # =====================================================
 BASE_DIR = os.path.dirname(__file__)
 DATA_PATH = os.path.join(BASE_DIR, "data.csv")
+OUTPUT_PATH = os.path.join(BASE_DIR, "stress_dataset_clean.csv")
+
+# Streaming mode output: memory-mappable matrix + labels + metadata
+MATRIX_PATH = os.path.join(BASE_DIR, "stress_dataset_clean.npy")
+LABELS_PATH = os.path.join(BASE_DIR, "stress_labels.npy")
+META_PATH = os.path.join(BASE_DIR, "stress_dataset_clean.json")
 
-# Load dataset (DASS is tab-separated)
-df = pd.read_csv(DATA_PATH, sep="\t")
+CHUNK_ROWS = 200_000
 
-print("Dataset shape:", df.shape)
-print(df.head())
-print(df.columns.tolist())
+
+class OutOfRangeError(ValueError):
+    """
+    Parsed values that cannot be DASS Likert data (outside int8).
+    """
 
 # =====================================================
 # STRESS QUESTIONS
 # =====================================================
 STRESS_COLS = ["Q1A", "Q6A", "Q8A", "Q11A", "Q12A", "Q14A", "Q18A"]
+FEATURE_COLS = STRESS_COLS + ["stress_score"]
 
-# Keep only stress-related columns
-df_stress = df[STRESS_COLS].copy()
-
-# Drop rows with missing values
-df_stress.dropna(inplace=True)
+# Sorted, so codes match LabelEncoder().classes_ and the model bundle
+LABELS = ["High", "Low", "Moderate"]
+HIGH_THRESHOLD = 19
+MODERATE_THRESHOLD = 10
 
-# Convert to integers safely
-for col in STRESS_COLS:
-    df_stress[col] = pd.to_numeric(df_stress[col], errors="coerce")
+# =====================================================
+# LABEL GENERATION
+# =====================================================
+def label_stress(score):
+    if score >= HIGH_THRESHOLD:
+        return "High"
+    elif score >= MODERATE_THRESHOLD:
+        return "Moderate"
+    else:
+        return "Low"
 
-df_stress.dropna(inplace=True)
-df_stress = df_stress.astype(int)
 
-print("Cleaned shape:", df_stress.shape)
+def label_codes(scores: np.ndarray) -> np.ndarray:
+    """
+    Vectorized label_stress, as int8 indices into LABELS.
+    """
+    return np.select(
+        [scores >= HIGH_THRESHOLD, scores >= MODERATE_THRESHOLD],
+        [LABELS.index("High"), LABELS.index("Moderate")],
+        default=LABELS.index("Low")
+    ).astype(np.int8)
 
 # =====================================================
-# FEATURE ENGINEERING
+# IN-MEMORY CLEANING (ORIGINAL PIPELINE)
 # =====================================================
-df_stress["stress_score"] = df_stress.sum(axis=1)
-print(df_stress["stress_score"].describe())
+def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    # Keep only stress-related columns
+    df_stress = df[STRESS_COLS].copy()
+
+    # Drop rows with missing values
+    df_stress.dropna(inplace=True)
+
+    # Convert to integers safely
+    for col in STRESS_COLS:
+        df_stress[col] = pd.to_numeric(df_stress[col], errors="coerce")
+
+    df_stress.dropna(inplace=True)
+    df_stress = df_stress.astype(int)
+
+    # FEATURE ENGINEERING
+    df_stress["stress_score"] = df_stress.sum(axis=1)
+    df_stress["stress_label"] = df_stress["stress_score"].apply(label_stress)
+
+    return df_stress
+
+
+def clean_in_memory(data_path: str = DATA_PATH, output_path: str = OUTPUT_PATH):
+    # Load dataset (DASS is tab-separated)
+    df = pd.read_csv(data_path, sep="\t")
+
+    print("Dataset shape:", df.shape)
+
+    df_stress = clean_dataframe(df)
+
+    print("Cleaned shape:", df_stress.shape)
+    print(df_stress["stress_score"].describe())
+    print(df_stress["stress_label"].value_counts())
+
+    df_stress.to_csv(output_path, index=False)
+
+    print("Saved clean dataset ✔")
+    print("Path:", output_path)
+    return df_stress
 
 # =====================================================
-# LABEL GENERATION
+# STREAMING CLEANING (CHUNKED, TYPED, COLUMNAR OUTPUT)
 # =====================================================
-def label_stress(score):
-    if score >= 19:
-        return "High"
-    elif score >= 10:
-        return "Moderate"
+def _read_chunks(data_path: str, chunk_rows: int, typed: bool):
+    # Only the 7 stress columns are parsed; the rest are skipped.
+    # float32, not a nullable Int8: pandas silently wraps out-of-range
+    # ints (300 → 44), while floats keep them for the range check.
+    return pd.read_csv(
+        data_path,
+        sep="\t",
+        usecols=STRESS_COLS,
+        dtype="float32" if typed else str,
+        chunksize=chunk_rows,
+        engine="c"
+    )
+
+
+def clean_chunk(chunk: pd.DataFrame, typed: bool = True) -> np.ndarray:
+    """
+    One raw chunk → int8 (n, 8) rows of FEATURE_COLS, same rules as
+    clean_dataframe (drop missing / non-numeric rows, truncate to int).
+    """
+    if typed:
+        values = chunk[STRESS_COLS].to_numpy(dtype=np.float32)
     else:
-        return "Low"
+        values = np.column_stack([
+            pd.to_numeric(chunk[col], errors="coerce").to_numpy(dtype=np.float64)
+            for col in STRESS_COLS
+        ])
 
-df_stress["stress_label"] = df_stress["stress_score"].apply(label_stress)
-print(df_stress["stress_label"].value_counts())
+    values = values[~np.isnan(values).any(axis=1)]
+    items = values.astype(np.int64)
+
+    if items.size and (items.min() < -128 or items.max() > 127):
+        raise OutOfRangeError("answer values outside int8 range — not DASS Likert data")
+
+    scores = items.sum(axis=1)
+    if scores.size and (scores.min() < -128 or scores.max() > 127):
+        raise OutOfRangeError("stress_score outside int8 range")
+
+    return np.column_stack([items, scores]).astype(np.int8)
+
+
+def _stream_to_raw(data_path, chunk_rows, typed, features_raw, labels_raw):
+    rows = 0
+    for chunk in _read_chunks(data_path, chunk_rows, typed):
+        block = clean_chunk(chunk, typed)
+        features_raw.write(block.tobytes())
+        labels_raw.write(label_codes(block[:, -1]).tobytes())
+        rows += len(block)
+    return rows
+
+
+def _raw_to_npy(raw_path, out_path, shape):
+    # Copy the raw stream into a proper .npy without loading it all
+    out = np.lib.format.open_memmap(out_path + ".tmp", mode="w+", dtype=np.int8, shape=shape)
+    if shape[0]:
+        src = np.memmap(raw_path, dtype=np.int8, mode="r", shape=shape)
+        for start in range(0, shape[0], CHUNK_ROWS * 4):
+            out[start:start + CHUNK_ROWS * 4] = src[start:start + CHUNK_ROWS * 4]
+        del src
+    out.flush()
+    del out
+    os.replace(out_path + ".tmp", out_path)
+
+
+def clean_streaming(
+    data_path: str = DATA_PATH,
+    matrix_path: str = MATRIX_PATH,
+    labels_path: str = LABELS_PATH,
+    meta_path: str = META_PATH,
+    chunk_rows: int = CHUNK_ROWS
+) -> dict:
+    """
+    Clean a DASS dump of any size in constant memory.
+
+    Writes int8 FEATURE_COLS rows to `matrix_path`, int8 label codes
+    (indices into LABELS) to `labels_path` and a JSON sidecar. Both
+    .npy files can be opened with mmap_mode="r" by training.
+    """
+    out_dir = os.path.dirname(os.path.abspath(matrix_path))
+
+    with tempfile.TemporaryDirectory(dir=out_dir) as tmp_dir:
+        features_tmp = os.path.join(tmp_dir, "features.raw")
+        labels_tmp = os.path.join(tmp_dir, "labels.raw")
+
+        # Typed parse first; a dump with stray non-numeric cells falls
+        # back to string parsing + coercion (the original semantics)
+        for typed in (True, False):
+            try:
+                with open(features_tmp, "wb") as features_raw, \
+                        open(labels_tmp, "wb") as labels_raw:
+                    rows = _stream_to_raw(
+                        data_path, chunk_rows, typed, features_raw, labels_raw
+                    )
+                break
+            except OutOfRangeError:
+                # Re-reading as strings would only fail the same way
+                raise
+            except (ValueError, TypeError):
+                if not typed:
+                    raise
+                print("⚠ Non-numeric cells found — re-reading with coercion")
+
+        _raw_to_npy(features_tmp, matrix_path, (rows, len(FEATURE_COLS)))
+        _raw_to_npy(labels_tmp, labels_path, (rows,))
+
+    labels = np.load(labels_path, mmap_mode="r")
+    meta = {
+        "source": os.path.abspath(data_path),
+        "rows": rows,
+        "feature_columns": FEATURE_COLS,
+        "label_mapping": LABELS,
+        "label_counts": {
+            name: int(n) for name, n in zip(LABELS, np.bincount(labels, minlength=len(LABELS)))
+        },
+        "dtype": "int8",
+        "matrix_path": os.path.basename(matrix_path),
+        "labels_path": os.path.basename(labels_path)
+    }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+
+    return meta
+
+
+def load_clean_matrix(
+    matrix_path: str = MATRIX_PATH,
+    labels_path: str = LABELS_PATH,
+    meta_path: str = META_PATH
+):
+    """
+    Memory-mapped (X, y, meta) written by clean_streaming.
+    """
+    with open(meta_path) as f:
+        meta = json.load(f)
+    X = np.load(matrix_path, mmap_mode="r")
+    y = np.load(labels_path, mmap_mode="r")
+    return X, y, meta
 
 # =====================================================
-# SAVE CLEAN DATASET
+# EQUIVALENCE CHECK
 # =====================================================
-OUTPUT_PATH = os.path.join(BASE_DIR, "stress_dataset_clean.csv")
-df_stress.to_csv(OUTPUT_PATH, index=False)
+def _synthetic_dump(path, rows, junk, seed=0):
+    """
+    DASS-shaped TSV: many extra columns, missing and junk cells.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(1, 43):
+        for suffix in ("A", "I", "E"):
+            data[f"Q{i}{suffix}"] = rng.integers(1, 5, rows)
+    df = pd.DataFrame(data)
+    df["country"] = "IN"
+
+    df = df.astype(object)
+    for col in STRESS_COLS:
+        holes = rng.random(rows) < 0.01
+        df.loc[holes, col] = np.nan
+    if junk:
+        df.loc[rng.random(rows) < 0.002, "Q8A"] = "x"
+
+    df.to_csv(path, sep="\t", index=False)
+
+
+def verify(rows: int = 50_000, chunk_rows: int = 7_919) -> int:
+    """
+    Streaming output must equal the original in-memory pipeline, on a
+    clean dump (typed path) and one with junk cells (coercion path).
+    """
+    checked = 0
+    for junk in (False, True):
+        checked += _verify_once(rows, chunk_rows, junk)
+    return checked
+
+
+def _verify_once(rows, chunk_rows, junk):
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "data.csv")
+        _synthetic_dump(data_path, rows, junk)
+
+        expected = clean_dataframe(
+            pd.read_csv(data_path, sep="\t", low_memory=False)
+        )
 
-print("Saved clean dataset ✔")
-print("Path:", OUTPUT_PATH)
+        meta = clean_streaming(
+            data_path,
+            os.path.join(tmp, "X.npy"),
+            os.path.join(tmp, "y.npy"),
+            os.path.join(tmp, "meta.json"),
+            chunk_rows=chunk_rows
+        )
+        X, y, _ = load_clean_matrix(
+            os.path.join(tmp, "X.npy"),
+            os.path.join(tmp, "y.npy"),
+            os.path.join(tmp, "meta.json")
+        )
+
+        assert meta["rows"] == len(expected), "row count differs"
+        assert np.array_equal(X, expected[FEATURE_COLS].to_numpy()), "features differ"
+        assert [LABELS[i] for i in y] == expected["stress_label"].tolist(), "labels differ"
+
+        del X, y
+        return len(expected)
+
+# =====================================================
+# CLI
+# =====================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean the DASS dataset.")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--stream", action="store_true",
+                        help="Chunked typed read → .npy matrix + labels + meta JSON")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--verify", action="store_true",
+                        help="Check streaming output against the in-memory pipeline")
+    args = parser.parse_args()
+
+    if args.verify:
+        n = verify()
+        print(f"✅ Streaming cleaning matches the in-memory pipeline ({n} rows)")
+        sys.exit(0)
+
+    if args.stream:
+        meta = clean_streaming(args.data, chunk_rows=args.chunk_rows)
+        print("Cleaned rows:", meta["rows"])
+        print("Labels:", meta["label_counts"])
+        print("Saved clean matrix ✔")
+        print("Path:", MATRIX_PATH)
+    else:
+        clean_in_memory(args.data)
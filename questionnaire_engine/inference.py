@@ -1,7 +1,12 @@
 import os
 import joblib
 import numpy as np
-import pandas as pd
+from typing import Dict, List
+
+from instrumentation import stage
+from model_registry import registry
+from questionnaire_engine.lookup import LUT_PATH, LookupPredictor, file_fingerprint
+from result_cache import ResultCache, file_version
 
 # =====================================================
 # PATHS
@@ -12,38 +17,101 @@ MODEL_PATH = os.path.join(
 )
 
 # =====================================================
-# LOAD MODEL BUNDLE
+# LOAD MODEL BUNDLE (LAZY, SHARED REGISTRY)
 # =====================================================
-bundle = joblib.load(MODEL_PATH)
+def _warmup_bundle(bundle):
+    bundle["model"].predict_proba(
+        np.zeros((1, len(bundle["feature_columns"])), dtype=np.float32)
+    )
+
 
-model = bundle["model"]
-feature_columns = bundle["feature_columns"]
-label_mapping = bundle["label_mapping"]
+registry.register(
+    "questionnaire_bundle",
+    lambda: joblib.load(MODEL_PATH),
+    warmup=_warmup_bundle
+)
 
 # =====================================================
-# INFERENCE FUNCTION (STANDARDIZED OUTPUT)
+# LOOKUP-TABLE BACKEND (OPTIONAL)
 # =====================================================
-def analyze_questionnaire(answers: dict):
-    """
-    Perform stress analysis using questionnaire responses.
+# auto    → lookup table if compiled for the current model, else XGBoost
+# lut     → require the lookup table
+# xgboost → always run the model
+# Build: python -m questionnaire_engine.lookup
+BACKEND = os.environ.get("QUESTIONNAIRE_BACKEND", "auto")
 
-    Returns standardized JSON-safe dict
-    compatible with fusion & UI layers.
+
+def _load_lookup():
+    if BACKEND == "xgboost":
+        return None
+
+    if os.path.exists(LUT_PATH):
+        lut = LookupPredictor.load(LUT_PATH)
+        if lut.fingerprint == file_fingerprint(MODEL_PATH):
+            return lut
+        print("⚠ Questionnaire lookup table is stale — using XGBoost")
+
+    if BACKEND == "lut":
+        raise RuntimeError(
+            "QUESTIONNAIRE_BACKEND=lut but no lookup table matches the model"
+        )
+    return None
+
+
+registry.register("questionnaire_lut", _load_lookup)
+
+
+def _model_meta():
+    """
+    (feature_columns, label_mapping) without loading XGBoost if possible.
     """
+    lut = registry.get("questionnaire_lut")
+    if lut is not None:
+        return lut.feature_columns, lut.label_mapping
+
+    bundle = registry.get("questionnaire_bundle")
+    return bundle["feature_columns"], bundle["label_mapping"]
+
 
-    # Convert answers dict → DataFrame
-    df = pd.DataFrame([answers])
+def _predict_proba(X):
+    lut = registry.get("questionnaire_lut")
+    if lut is None:
+        return registry.get("questionnaire_bundle")["model"].predict_proba(X)
 
-    # Ensure correct feature order
-    df = df.reindex(columns=feature_columns, fill_value=0)
+    proba, covered = lut.predict_proba(X)
 
-    # Model prediction
-    pred_idx = int(model.predict(df)[0])
-    proba = model.predict_proba(df)[0]
+    # Inputs outside the answer grid go to the real model
+    if not covered.all():
+        model = registry.get("questionnaire_bundle")["model"]
+        proba[~covered] = model.predict_proba(X[~covered])
 
-    risk_level = label_mapping[pred_idx]
-    confidence = float(np.max(proba))
+    return proba
+
+# =====================================================
+# FEATURE MATRIX (NUMPY FAST PATH)
+# =====================================================
+def build_feature_matrix(answers_list: List[Dict], feature_columns: List[str]):
+    """
+    Contiguous float32 (N, F) matrix in `feature_columns` order.
 
+    Same semantics as DataFrame(...).reindex(columns=..., fill_value=0):
+    unknown keys are ignored, missing features are 0.
+    """
+    column_index = {col: j for j, col in enumerate(feature_columns)}
+    X = np.zeros((len(answers_list), len(feature_columns)), dtype=np.float32)
+
+    for row, answers in enumerate(answers_list):
+        for key, value in answers.items():
+            j = column_index.get(key)
+            if j is not None:
+                X[row, j] = value
+
+    return X
+
+# =====================================================
+# RESULT BUILDER (STANDARDIZED OUTPUT)
+# =====================================================
+def _build_result(answers: Dict, risk_level: str, confidence: float):
     # Simple explainable stress score
     stress_score = int(sum(answers.values()))
 
@@ -57,3 +125,74 @@ def analyze_questionnaire(answers: dict):
         },
         "explanation": "Questionnaire responses indicate stress patterns."
     }
+
+# =====================================================
+# RESULT CACHE
+# =====================================================
+# Identical answer vectors are common; RESULT_CACHE_MAX / _TTL tune it
+_cache = ResultCache("questionnaire")
+
+
+def _model_version():
+    # File changes and registry reloads/overrides both change the key
+    name = (
+        "questionnaire_lut" if registry.get("questionnaire_lut") is not None
+        else "questionnaire_bundle"
+    )
+    return file_version(MODEL_PATH), registry.generation(name)
+
+
+def cache_stats():
+    return _cache.stats()
+
+# =====================================================
+# BATCH INFERENCE
+# =====================================================
+def analyze_questionnaires(answers_list: List[Dict]):
+    """
+    Score many questionnaire submissions with one predict_proba pass.
+
+    Repeated answer vectors (within the batch or across calls) are
+    scored once and served from the result cache.
+    Returns one standardized dict per submission, in order.
+    """
+    if not answers_list:
+        return []
+
+    feature_columns, label_mapping = _model_meta()
+    version = _model_version()
+
+    keys = [(version, tuple(sorted(answers.items()))) for answers in answers_list]
+    return _cache.get_or_compute(
+        keys,
+        answers_list,
+        lambda misses: _score(misses, feature_columns, label_mapping)
+    )
+
+
+def _score(answers_list: List[Dict], feature_columns, label_mapping):
+    with stage("questionnaire_features"):
+        X = build_feature_matrix(answers_list, feature_columns)
+
+    # Label = argmax of the probabilities (what model.predict does)
+    with stage("questionnaire_predict"):
+        proba = _predict_proba(X)
+    pred_idx = proba.argmax(axis=1)
+    confidence = proba.max(axis=1)
+
+    return [
+        _build_result(answers, label_mapping[int(idx)], float(conf))
+        for answers, idx, conf in zip(answers_list, pred_idx, confidence)
+    ]
+
+# =====================================================
+# INFERENCE FUNCTION (STANDARDIZED OUTPUT)
+# =====================================================
+def analyze_questionnaire(answers: dict):
+    """
+    Perform stress analysis using questionnaire responses.
+
+    Returns standardized JSON-safe dict
+    compatible with fusion & UI layers.
+    """
+    return analyze_questionnaires([answers])[0]
@@ -0,0 +1,189 @@
+import argparse
+import hashlib
+import itertools
+import os
+
+import numpy as np
+
+# =====================================================
+# PATHS
+# =====================================================
+BASE_DIR = os.path.dirname(__file__)
+MODEL_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "models", "questionnaire"))
+MODEL_PATH = os.path.join(MODEL_DIR, "stress_model.pkl")
+LUT_PATH = os.path.join(MODEL_DIR, "stress_model_lut.npz")
+
+# =====================================================
+# DOMAIN
+# =====================================================
+# Likert answers (0 = unanswered, DASS items are 1–4)
+LEVELS = 5
+SCORE_COLUMN = "stress_score"
+
+
+def file_fingerprint(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+# =====================================================
+# LOOKUP PREDICTOR
+# =====================================================
+class LookupPredictor:
+    """
+    Precomputed predict_proba over every possible answer vector.
+
+    The 7 stress items take LEVELS discrete values, so the full input
+    space is LEVELS**7 rows. `stress_score` is either the item sum or
+    0 (not submitted, filled by reindex), so two tables cover every
+    input the app produces. Anything else is reported as not covered
+    and should go to the real model.
+    """
+
+    def __init__(self, tables, feature_columns, label_mapping, fingerprint):
+        self.tables = tables                      # (2, LEVELS**k, C) float32
+        self.feature_columns = list(feature_columns)
+        self.label_mapping = list(label_mapping)
+        self.fingerprint = fingerprint
+
+        self.item_index = [
+            j for j, c in enumerate(self.feature_columns) if c != SCORE_COLUMN
+        ]
+        self.score_index = (
+            self.feature_columns.index(SCORE_COLUMN)
+            if SCORE_COLUMN in self.feature_columns else None
+        )
+        self.radix = LEVELS ** np.arange(len(self.item_index), dtype=np.int64)
+
+    @classmethod
+    def load(cls, path: str = LUT_PATH):
+        data = np.load(path, allow_pickle=False)
+        return cls(
+            data["tables"],
+            data["feature_columns"].tolist(),
+            data["label_mapping"].tolist(),
+            str(data["fingerprint"])
+        )
+
+    def predict_proba(self, X: np.ndarray):
+        """
+        Returns (proba, covered). Rows with covered=False are zeros.
+        """
+        items = X[:, self.item_index]
+        codes = items.astype(np.int64)
+
+        covered = (
+            (codes == items).all(axis=1) &
+            (codes >= 0).all(axis=1) &
+            (codes < LEVELS).all(axis=1)
+        )
+
+        table = np.zeros(len(X), dtype=np.int64)
+        if self.score_index is not None:
+            score = X[:, self.score_index]
+            is_sum = score == codes.sum(axis=1)
+            covered &= is_sum | (score == 0)
+            table[~is_sum] = 1
+
+        keys = np.where(covered, codes @ self.radix, 0)
+
+        proba = self.tables[table, keys]
+        proba[~covered] = 0.0
+
+        return proba, covered
+
+# =====================================================
+# EXPORTER
+# =====================================================
+def answer_grid(n_items: int) -> np.ndarray:
+    """
+    Every answer vector, ordered so row i has key i (little-endian radix).
+    """
+    grid = np.array(
+        list(itertools.product(range(LEVELS), repeat=n_items)),
+        dtype=np.float32
+    )
+    return grid[:, ::-1].copy()
+
+
+def grid_matrix(feature_columns, grid, zero_score: bool):
+    X = np.zeros((len(grid), len(feature_columns)), dtype=np.float32)
+    item_index = [j for j, c in enumerate(feature_columns) if c != SCORE_COLUMN]
+    X[:, item_index] = grid
+
+    if SCORE_COLUMN in feature_columns and not zero_score:
+        X[:, feature_columns.index(SCORE_COLUMN)] = grid.sum(axis=1)
+
+    return X
+
+
+def compile_lookup(model_path: str = MODEL_PATH, out_path: str = LUT_PATH):
+    import joblib
+
+    bundle = joblib.load(model_path)
+    model = bundle["model"]
+    feature_columns = list(bundle["feature_columns"])
+
+    n_items = sum(c != SCORE_COLUMN for c in feature_columns)
+    grid = answer_grid(n_items)
+
+    tables = np.stack([
+        model.predict_proba(grid_matrix(feature_columns, grid, zero_score))
+        for zero_score in (False, True)
+    ]).astype(np.float32)
+
+    np.savez_compressed(
+        out_path,
+        tables=tables,
+        feature_columns=np.array(feature_columns),
+        label_mapping=np.array(bundle["label_mapping"]),
+        fingerprint=np.array(file_fingerprint(model_path))
+    )
+
+    return tables.shape
+
+# =====================================================
+# EXHAUSTIVE EQUIVALENCE CHECK
+# =====================================================
+def verify(model_path: str = MODEL_PATH, lut_path: str = LUT_PATH):
+    """
+    Compare the lookup against predict_proba on every covered input.
+    Returns the number of rows checked; raises AssertionError on drift.
+    """
+    import joblib
+
+    model = joblib.load(model_path)["model"]
+    lut = LookupPredictor.load(lut_path)
+
+    grid = answer_grid(len(lut.item_index))
+    checked = 0
+
+    for zero_score in (False, True):
+        X = grid_matrix(lut.feature_columns, grid, zero_score)
+
+        expected = model.predict_proba(X)
+        actual, covered = lut.predict_proba(X)
+
+        assert covered.all(), "grid row not covered by lookup"
+        assert np.array_equal(actual, expected), "probabilities differ"
+        assert np.array_equal(actual.argmax(1), model.predict(X)), "labels differ"
+        checked += len(X)
+
+    return checked
+
+# =====================================================
+# CLI
+# =====================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compile the questionnaire model into a lookup table."
+    )
+    parser.add_argument("--verify", action="store_true",
+                        help="Only run the exhaustive equivalence check")
+    args = parser.parse_args()
+
+    if not args.verify:
+        shape = compile_lookup()
+        print(f"✅ Lookup table saved: {LUT_PATH} {shape}")
+
+    rows = verify()
+    print(f"✅ Lookup matches predict_proba on all {rows} inputs")
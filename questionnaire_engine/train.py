@@ -0,0 +1,301 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import joblib
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from questionnaire_engine.data_cleaning import (
+    FEATURE_COLS,
+    LABELS,
+    META_PATH,
+    load_clean_matrix,
+)
+
+# =====================================================
+# PATHS
+# =====================================================
+BASE_DIR = os.path.dirname(__file__)
+CSV_PATH = os.path.join(BASE_DIR, "stress_dataset_clean.csv")
+MODEL_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "models", "questionnaire"))
+MODEL_PATH = os.path.join(MODEL_DIR, "stress_model.pkl")
+
+# =====================================================
+# SEARCH SPACE
+# =====================================================
+SEARCH_SPACE = {
+    "max_depth": [3, 4, 5, 6],
+    "learning_rate": [0.03, 0.05, 0.1, 0.2],
+    "subsample": [0.8, 0.9, 1.0],
+    "colsample_bytree": [0.8, 0.9, 1.0],
+    "min_child_weight": [1, 3, 5],
+}
+
+MAX_ROUNDS = 1000
+EARLY_STOPPING_ROUNDS = 30
+SEED = 42
+
+# =====================================================
+# DATA (CACHED BINARY MATRIX)
+# =====================================================
+def _file_version(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_training_data(csv_path=None):
+    """
+    (X int8, y int8 codes into LABELS, source description).
+
+    Without an explicit CSV, prefers the memory-mapped output of
+    `data_cleaning.py --stream`. A CSV is parsed once and cached next
+    to it as .npz, keyed on the CSV's mtime/size.
+    """
+    if csv_path is None and os.path.exists(META_PATH):
+        X, y, meta = load_clean_matrix()
+        return X, y, {"source": META_PATH, "rows": meta["rows"]}
+
+    csv_path = csv_path or CSV_PATH
+    cache_path = os.path.splitext(csv_path)[0] + ".cache.npz"
+
+    version = _file_version(csv_path)
+    if os.path.exists(cache_path):
+        cached = np.load(cache_path)
+        if cached["source_version"].tolist() == version:
+            return cached["X"], cached["y"], {"source": cache_path, "rows": len(cached["y"])}
+
+    import pandas as pd
+
+    df = pd.read_csv(
+        csv_path,
+        usecols=FEATURE_COLS + ["stress_label"],
+        dtype={**{c: np.int8 for c in FEATURE_COLS}, "stress_label": "category"}
+    )
+    X = df[FEATURE_COLS].to_numpy(dtype=np.int8)
+    y = np.array([LABELS.index(v) for v in df["stress_label"].cat.categories], dtype=np.int8)[
+        df["stress_label"].cat.codes.to_numpy()
+    ]
+
+    np.savez(cache_path, X=X, y=y, source_version=np.array(version))
+    return X, y, {"source": csv_path, "rows": len(y)}
+
+
+def split(y, seed=SEED):
+    """
+    Stratified train / validation (early stopping) / test indices.
+    """
+    from sklearn.model_selection import train_test_split
+
+    index = np.arange(len(y))
+    train_val, test = train_test_split(
+        index, test_size=0.2, random_state=seed, stratify=y
+    )
+    train, val = train_test_split(
+        train_val, test_size=0.125, random_state=seed, stratify=y[train_val]
+    )
+    return train, val, test
+
+# =====================================================
+# SEARCH
+# =====================================================
+def sample_params(trials: int, seed: int = SEED):
+    rng = random.Random(seed)
+    seen, out = set(), []
+
+    space = 1
+    for values in SEARCH_SPACE.values():
+        space *= len(values)
+
+    while len(out) < min(trials, space):
+        params = {k: rng.choice(v) for k, v in SEARCH_SPACE.items()}
+        key = tuple(sorted(params.items()))
+        if key not in seen:
+            seen.add(key)
+            out.append(params)
+    return out
+
+
+def fit_trial(params, X_train, y_train, X_val, y_val, n_jobs=1, seed=SEED):
+    from xgboost import XGBClassifier
+
+    model = XGBClassifier(
+        **params,
+        n_estimators=MAX_ROUNDS,
+        tree_method="hist",
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        eval_metric="mlogloss",
+        random_state=seed,
+        n_jobs=n_jobs
+    )
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train, eval_set=[(X_val, y_val)], verbose=False)
+
+    return {
+        "params": params,
+        "best_iteration": int(model.best_iteration),
+        "val_logloss": float(model.best_score),
+        "fit_seconds": round(time.perf_counter() - start, 3),
+        "model": model,
+    }
+
+# =====================================================
+# INFERENCE LATENCY
+# =====================================================
+def measure_inference(model, X, repeats=200):
+    single = X[:1].astype(np.float32)
+    model.predict_proba(single)
+
+    samples = []
+    for _ in range(repeats):
+        t = time.perf_counter()
+        model.predict_proba(single)
+        samples.append(time.perf_counter() - t)
+
+    batch = X.astype(np.float32)
+    t = time.perf_counter()
+    model.predict_proba(batch)
+    batch_seconds = time.perf_counter() - t
+
+    return {
+        "single_row_p50_ms": round(float(np.percentile(samples, 50)) * 1000, 4),
+        "single_row_p99_ms": round(float(np.percentile(samples, 99)) * 1000, 4),
+        "batch_rows": len(batch),
+        "batch_rows_per_s": round(len(batch) / batch_seconds, 1),
+    }
+
+# =====================================================
+# PLOT (HEADLESS)
+# =====================================================
+def save_curve(model, path):
+    try:
+        import matplotlib
+    except ImportError:
+        print("⚠ matplotlib not installed — skipping training curve")
+        return False
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    results = model.evals_result()
+    plt.figure()
+    plt.plot(results["validation_0"]["mlogloss"], label="Validation")
+    plt.axvline(model.best_iteration, linestyle="--", label="Best iteration")
+    plt.legend()
+    plt.title("XGBoost Training Curve")
+    plt.xlabel("Boosting Rounds")
+    plt.ylabel("Log Loss")
+    plt.savefig(path, dpi=120, bbox_inches="tight")
+    plt.close()
+    return True
+
+# =====================================================
+# MAIN
+# =====================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Train the questionnaire stress model (headless)."
+    )
+    parser.add_argument("--data", help="clean CSV (default: streamed matrix, else "
+                        "stress_dataset_clean.csv; CSVs are cached as .npz)")
+    parser.add_argument("--out", default=MODEL_PATH)
+    parser.add_argument("--trials", type=int, default=24)
+    parser.add_argument("--jobs", type=int, default=-1,
+                        help="parallel trials (-1 = all cores)")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--plot", help="save the validation curve PNG here")
+    parser.add_argument("--no-lookup", action="store_true",
+                        help="skip recompiling the questionnaire lookup table")
+    args = parser.parse_args(argv)
+
+    from joblib import Parallel, delayed
+    from sklearn.metrics import accuracy_score, classification_report, log_loss
+
+    total_start = time.perf_counter()
+
+    # ================= DATA =================
+    X, y, data_info = load_training_data(args.data)
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y, dtype=np.int64)
+    train, val, test = split(y, args.seed)
+    print(f"📦 {len(y)} rows from {data_info['source']}")
+
+    # ================= PARALLEL SEARCH =================
+    # One thread per trial; parallelism comes from running trials side by side
+    candidates = sample_params(args.trials, args.seed)
+    search_start = time.perf_counter()
+    trials = Parallel(n_jobs=args.jobs)(
+        delayed(fit_trial)(params, X[train], y[train], X[val], y[val], 1, args.seed)
+        for params in candidates
+    )
+    search_seconds = time.perf_counter() - search_start
+
+    trials.sort(key=lambda t: t["val_logloss"])
+    best = trials[0]
+    model = best["model"]
+    print(
+        f"🔎 {len(trials)} trials in {search_seconds:.1f}s — best val logloss "
+        f"{best['val_logloss']:.4f} @ {best['best_iteration']} rounds {best['params']}"
+    )
+
+    # ================= EVALUATION =================
+    proba = model.predict_proba(X[test])
+    y_pred = proba.argmax(axis=1)
+
+    print("\n📊 Classification Report\n")
+    print(classification_report(y[test], y_pred, target_names=LABELS))
+
+    # ================= SAVE BUNDLE =================
+    bundle = {
+        "model": model,
+        "feature_columns": list(FEATURE_COLS),
+        "label_mapping": list(LABELS),
+        "metadata": {
+            "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "data": {**data_info, "train": len(train), "val": len(val), "test": len(test)},
+            "tree_method": "hist",
+            "best_params": best["params"],
+            "best_iteration": best["best_iteration"],
+            "val_logloss": round(best["val_logloss"], 5),
+            "test_logloss": round(float(log_loss(y[test], proba, labels=range(len(LABELS)))), 5),
+            "test_accuracy": round(float(accuracy_score(y[test], y_pred)), 5),
+            "search": {
+                "trials": len(trials),
+                "seconds": round(search_seconds, 2),
+                "leaderboard": [
+                    {k: t[k] for k in ("params", "val_logloss", "best_iteration", "fit_seconds")}
+                    for t in trials[:5]
+                ],
+            },
+            "train_seconds": round(time.perf_counter() - total_start, 2),
+            "inference": measure_inference(model, X[test]),
+            "xgboost_version": __import__("xgboost").__version__,
+        },
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    joblib.dump(bundle, args.out)
+    print(f"\n✅ Model bundle saved at: {args.out}")
+    print(json.dumps(bundle["metadata"]["inference"], indent=2))
+
+    if args.plot and save_curve(model, args.plot):
+        print(f"📈 Training curve saved at: {args.plot}")
+
+    # The serving lookup table is keyed to the model file; rebuild it
+    if not args.no_lookup and os.path.abspath(args.out) == os.path.abspath(MODEL_PATH):
+        from questionnaire_engine.lookup import compile_lookup, verify
+        compile_lookup(args.out)
+        print(f"✅ Lookup table rebuilt and verified on {verify(args.out)} inputs")
+
+    return bundle
+
+
+if __name__ == "__main__":
+    main()
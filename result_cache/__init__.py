@@ -0,0 +1,8 @@
+from result_cache.cache import (
+    ResultCache,
+    content_key,
+    copy_result,
+    file_version,
+)
+
+__all__ = ["ResultCache", "content_key", "copy_result", "file_version"]
@@ -0,0 +1,178 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# =====================================================
+# CONFIG
+# =====================================================
+# RESULT_CACHE_MAX=0 disables caching; RESULT_CACHE_TTL in seconds
+CACHE_MAX_ENTRIES = int(os.environ.get("RESULT_CACHE_MAX", 10000))
+CACHE_TTL_SECONDS = (
+    float(os.environ["RESULT_CACHE_TTL"])
+    if os.environ.get("RESULT_CACHE_TTL") else None
+)
+
+_MISSING = object()
+
+# =====================================================
+# KEY HELPERS
+# =====================================================
+def content_key(text: str) -> bytes:
+    """
+    Fixed-size digest of a text, so long inputs don't pin memory.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def file_version(path: str) -> Optional[Tuple[int, int]]:
+    """
+    (mtime_ns, size) of a model file; changes when the file is replaced.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def copy_result(result: Dict) -> Dict:
+    # Engine results are two levels deep; callers may mutate them
+    return {
+        k: dict(v) if isinstance(v, dict) else v
+        for k, v in result.items()
+    }
+
+# =====================================================
+# LRU + TTL RESULT CACHE
+# =====================================================
+class ResultCache:
+    """
+    Bounded, thread-safe memo of engine results.
+
+    Keys are (model_version, content) pairs built by the engine, so a
+    new model file or registry override never hits old entries; those
+    simply age out of the LRU.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl_seconds: Optional[float] = CACHE_TTL_SECONDS
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Cached value (a copy) or None.
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self._counters["misses"] += 1
+                return None
+
+            stored_at, value = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._data[key]
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+
+            self._data.move_to_end(key)
+            self._counters["hits"] += 1
+
+        return copy_result(value)
+
+    def set(self, key: Hashable, value: Dict):
+        if not self.enabled:
+            return
+
+        value = copy_result(value)
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def get_or_compute(
+        self,
+        keys: Sequence[Hashable],
+        items: Sequence,
+        compute: Callable[[List], List]
+    ) -> List[Dict]:
+        """
+        Results for a batch, in order. Each distinct key is looked up
+        once; `compute` runs once over the items of the distinct misses
+        and every position sharing a key gets its own copy.
+        """
+        positions: Dict[Hashable, List[int]] = {}
+        for i, key in enumerate(keys):
+            positions.setdefault(key, []).append(i)
+
+        results: List[Optional[Dict]] = [None] * len(keys)
+        missing = []
+
+        for key, idx in positions.items():
+            value = self.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                self._fan_out(results, idx, value)
+
+        if missing:
+            computed = compute([items[positions[key][0]] for key in missing])
+            for key, value in zip(missing, computed):
+                self.set(key, value)
+                self._fan_out(results, positions[key], value)
+
+        # Repeats within the batch are served without touching the model
+        if self.enabled and len(positions) < len(keys):
+            with self._lock:
+                self._counters["hits"] += len(keys) - len(positions)
+
+        return results
+
+    @staticmethod
+    def _fan_out(results, idx, value):
+        results[idx[0]] = value
+        for i in idx[1:]:
+            results[i] = copy_result(value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+            size = len(self._data)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "cache": self.name,
+            "entries": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            **counters
+        }
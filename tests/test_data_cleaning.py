@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from questionnaire_engine.data_cleaning import (
+    STRESS_COLS,
+    OutOfRangeError,
+    _synthetic_dump,
+    clean_streaming,
+    verify,
+)
+
+# =====================================================
+# STREAMING vs IN-MEMORY CLEANING
+# =====================================================
+def test_streaming_matches_in_memory():
+    assert verify(rows=20_000, chunk_rows=3_001) > 0
+
+
+def test_out_of_range_fails_without_coercion_retry(tmp_path, capsys):
+    data_path = os.path.join(tmp_path, "data.csv")
+    _synthetic_dump(data_path, 1_000, junk=False)
+
+    with open(data_path) as f:
+        lines = f.read().splitlines()
+    header = lines[0].split("\t")
+    row = lines[1].split("\t")
+    row[header.index(STRESS_COLS[0])] = "300"
+    lines[1] = "\t".join(row)
+    with open(data_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+    with pytest.raises(OutOfRangeError):
+        clean_streaming(
+            data_path,
+            os.path.join(tmp_path, "X.npy"),
+            os.path.join(tmp_path, "y.npy"),
+            os.path.join(tmp_path, "meta.json")
+        )
+    assert "re-reading" not in capsys.readouterr().out
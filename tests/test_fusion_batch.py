@@ -0,0 +1,10 @@
+import pytest
+
+from fusion_engine.batch import verify
+
+# =====================================================
+# fuse_batch vs fuse_results
+# =====================================================
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_fuse_batch_matches_fuse_results(seed):
+    assert verify(n=50000, seed=seed) == 50000
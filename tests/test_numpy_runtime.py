@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+from text_engine.numpy_runtime import H5_PATH, NPZ_PATH, NumpySentimentModel, file_fingerprint, verify
+
+# =====================================================
+# COMMITTED NUMPY EXPORT vs KERAS
+# =====================================================
+pytestmark = pytest.mark.skipif(
+    not (os.path.exists(H5_PATH) and os.path.exists(NPZ_PATH)),
+    reason="Keras sentiment model or NumPy export not built"
+)
+
+
+def test_export_built_from_current_model():
+    # TEXT_BACKEND=auto only serves an export whose fingerprint matches
+    assert NumpySentimentModel.load(NPZ_PATH).fingerprint == file_fingerprint(H5_PATH), \
+        "stale NumPy export — run: python -m text_engine.numpy_runtime"
+
+
+def test_numpy_runtime_matches_keras():
+    pytest.importorskip("tensorflow")
+
+    assert verify() < 1e-4
@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+from questionnaire_engine.lookup import LUT_PATH, MODEL_PATH, LookupPredictor, file_fingerprint, verify
+
+# =====================================================
+# COMMITTED LOOKUP TABLE vs XGBOOST
+# =====================================================
+pytestmark = pytest.mark.skipif(
+    not (os.path.exists(MODEL_PATH) and os.path.exists(LUT_PATH)),
+    reason="questionnaire model or lookup table not built"
+)
+
+
+def test_lookup_built_from_current_model():
+    # A stale table is silently skipped at runtime (falls back to XGBoost)
+    assert LookupPredictor.load(LUT_PATH).fingerprint == file_fingerprint(MODEL_PATH), \
+        "stale lookup table — run: python -m questionnaire_engine.lookup"
+
+
+def test_lookup_matches_predict_proba():
+    pytest.importorskip("joblib")
+    pytest.importorskip("xgboost")
+
+    assert verify() > 0
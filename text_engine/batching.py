@@ -0,0 +1,126 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+
+# =====================================================
+# MICRO-BATCHING EXECUTOR
+# =====================================================
+class MicroBatcher:
+    """
+    Collects concurrent single-item calls into one batched call.
+
+    Callers block in `submit()` while a background worker takes
+    everything already queued. A lone request is dispatched at once;
+    only when others are waiting does the worker linger up to
+    `max_wait_ms` (or until `max_batch_size` items) for more. It then
+    runs `batch_fn` once on the whole list and fans the results back
+    out in order.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List], List],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    # =================================================
+    # PUBLIC API
+    # =================================================
+    def submit(self, item):
+        """
+        Run `batch_fn` on a single item, batched with concurrent calls.
+        """
+        # Batching disabled → call straight through
+        if self.max_batch_size == 1:
+            return self.batch_fn([item])[0]
+
+        self._ensure_worker()
+
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future.result()
+
+    # =================================================
+    # WORKER
+    # =================================================
+    def _ensure_worker(self):
+        # Threads do not survive fork (gunicorn), so restart per process
+        pid = os.getpid()
+        if self._worker is not None and self._pid == pid:
+            return
+
+        with self._lock:
+            if self._worker is not None and self._pid == pid:
+                return
+
+            if self._pid != pid:
+                self._queue = queue.Queue()
+
+            self._worker = threading.Thread(
+                target=self._run,
+                name="text-microbatcher",
+                daemon=True
+            )
+            self._pid = pid
+            self._worker.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+
+        # Whatever queued up while the last batch ran
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        # Nobody else waiting → no point holding this request back
+        if len(batch) == 1:
+            return batch
+
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+
+            try:
+                results = list(self.batch_fn(items))
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+
+            if len(results) != len(batch):
+                exc = RuntimeError(
+                    f"batch_fn returned {len(results)} results for {len(batch)} items"
+                )
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
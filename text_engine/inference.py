@@ -1,9 +1,15 @@
-import tensorflow as tf
 import pickle
 import numpy as np
 import os
-from tensorflow.keras.preprocessing.sequence import pad_sequences
-from tensorflow.keras.datasets import imdb
+from typing import List
+
+from instrumentation import stage
+from model_registry import registry
+from result_cache import ResultCache, content_key, file_version
+from text_engine.batching import MicroBatcher
+from text_engine.numpy_runtime import NPZ_PATH, NumpySentimentModel, file_fingerprint
+from text_engine.tokenizer import encode_texts as _encode_batch
+from text_engine.vocab import load_vocab_index
 
 # =====================================================
 # PATHS (MATCH CURRENT PROJECT STRUCTURE)
@@ -17,56 +23,101 @@ MODEL_PATH = os.path.join(MODEL_DIR, "sentiment_model.h5")
 CONFIG_PATH = os.path.join(MODEL_DIR, "preprocess_config.pkl")
 
 # =====================================================
-# LOAD MODEL + CONFIG
+# LOAD CONFIG
 # =====================================================
-sentiment_model = tf.keras.models.load_model(MODEL_PATH)
-
 with open(CONFIG_PATH, "rb") as f:
     config = pickle.load(f)
 
 VOCAB_SIZE = config["vocab_size"]
 MAX_LEN = config["max_len"]
 
-# Load IMDB word index once
-word_index = imdb.get_word_index()
-
 # =====================================================
-# TEXT ENCODING
+# LAZY MODELS (SHARED REGISTRY)
 # =====================================================
-def encode_text(text: str):
-    words = text.lower().split()
-    encoded = []
+# auto   → NumPy runtime if exported for the current .h5, else Keras
+# numpy  → require the NumPy export (the .h5 may be absent)
+# keras  → always load TensorFlow
+# tflite → quantized interpreter (opt-in: scores drift slightly)
+# Export: python -m text_engine.numpy_runtime
+# Quantize: python -m text_engine.tflite_backend --mode int8
+BACKEND = os.environ.get("TEXT_BACKEND", "auto")
 
-    for word in words:
-        idx = word_index.get(word, 2)  # 2 = OOV token
-        encoded.append(idx if idx < VOCAB_SIZE else 2)
 
-    if not encoded:
-        encoded = [2]
+def _load_numpy_model():
+    if BACKEND == "keras" or not os.path.exists(NPZ_PATH):
+        return None
 
-    return pad_sequences(
-        [encoded],
-        maxlen=MAX_LEN,
-        padding="post",
-        truncating="post"
-    )
+    model = NumpySentimentModel.load(NPZ_PATH)
+    if BACKEND == "numpy" or not os.path.exists(MODEL_PATH):
+        return model
+    if model.fingerprint == file_fingerprint(MODEL_PATH):
+        return model
+
+    print("⚠ NumPy sentiment export is stale — using Keras")
+    return None
+
+
+# TensorFlow is only imported when the Keras backend is used
+def _load_sentiment_model():
+    if BACKEND == "tflite":
+        from text_engine.tflite_backend import TFLITE_PATH, TFLiteSentimentModel
+        model = TFLiteSentimentModel(TFLITE_PATH)
+        if os.path.exists(MODEL_PATH) and model.fingerprint != file_fingerprint(MODEL_PATH):
+            print("⚠ TFLite sentiment model was converted from a different .h5")
+        return model
+
+    model = _load_numpy_model()
+    if model is not None:
+        return model
+
+    if BACKEND == "numpy":
+        raise RuntimeError(
+            "TEXT_BACKEND=numpy but no NumPy export found — "
+            "run: python -m text_engine.numpy_runtime"
+        )
+
+    import tensorflow as tf
+    return tf.keras.models.load_model(MODEL_PATH)
+
+
+def _warmup_sentiment_model(model):
+    model.predict(np.zeros((1, MAX_LEN), dtype=np.int32), verbose=0)
+
+
+registry.register(
+    "sentiment_model",
+    _load_sentiment_model,
+    warmup=_warmup_sentiment_model
+)
+
+# Memory-mapped IMDB vocabulary (build: python -m text_engine.vocab)
+registry.register("text_vocab", lambda: load_vocab_index(VOCAB_SIZE))
 
 # =====================================================
-# INFERENCE FUNCTION (STANDARDIZED OUTPUT)
+# MICRO-BATCHING CONFIG
 # =====================================================
-def analyze_text(text: str):
-    """
-    Perform sentiment + stress inference on input text.
+# Concurrent analyze_text() calls are grouped into one predict().
+# TEXT_BATCH_MAX_SIZE=1 disables batching.
+BATCH_MAX_SIZE = int(os.environ.get("TEXT_BATCH_MAX_SIZE", 32))
+BATCH_MAX_WAIT_MS = float(os.environ.get("TEXT_BATCH_MAX_WAIT_MS", 5))
 
-    Returns standardized JSON-safe dict
-    compatible with fusion & UI layers.
-    """
-    encoded = encode_text(text)
+# =====================================================
+# TEXT ENCODING
+# =====================================================
+def encode_text(text: str):
+    return encode_texts([text])
 
-    score = float(
-        sentiment_model.predict(encoded, verbose=0)[0][0]
-    )
 
+def encode_texts(texts: List[str]):
+    """
+    Encode many texts into a padded int32 (N, MAX_LEN) matrix.
+    """
+    return _encode_batch(texts, registry.get("text_vocab"), MAX_LEN)
+
+# =====================================================
+# RESULT BUILDER (STANDARDIZED OUTPUT)
+# =====================================================
+def _build_result(score: float):
     sentiment = "Positive" if score >= 0.5 else "Negative"
 
     # Explainable risk mapping
@@ -87,3 +138,84 @@ def analyze_text(text: str):
         },
         "explanation": "Text sentiment analysis indicates emotional stress level."
     }
+
+# =====================================================
+# RESULT CACHE
+# =====================================================
+# Short texts repeat a lot; RESULT_CACHE_MAX / _TTL tune it
+_cache = ResultCache("text")
+
+
+def _model_version():
+    registry.get("sentiment_model")
+    registry.get("text_vocab")
+    return (
+        file_version(MODEL_PATH),
+        file_version(NPZ_PATH),
+        registry.generation("sentiment_model"),
+        registry.generation("text_vocab")
+    )
+
+
+def cache_stats():
+    return _cache.stats()
+
+
+def _cached(texts: List[str], compute):
+    """
+    Serve cached results; run `compute` once on the distinct misses.
+    """
+    version = _model_version()
+    keys = [(version, content_key(text)) for text in texts]
+    return _cache.get_or_compute(keys, texts, compute)
+
+# =====================================================
+# BATCHED INFERENCE
+# =====================================================
+def _predict_texts(texts: List[str]):
+    """
+    One model call over `texts` (no cache).
+    """
+    if not texts:
+        return []
+
+    encoded = encode_texts(texts)
+
+    sentiment_model = registry.get("sentiment_model")
+    with stage("text_predict"):
+        scores = sentiment_model.predict(encoded, verbose=0)[:, 0]
+
+    return [_build_result(float(score)) for score in scores]
+
+
+def analyze_texts(texts: List[str]):
+    """
+    Perform sentiment + stress inference on many texts
+    with a single model call (repeated texts come from the cache).
+
+    Returns one standardized dict per input text, in order.
+    """
+    if not texts:
+        return []
+    return _cached(texts, _predict_texts)
+
+
+_batcher = MicroBatcher(
+    _predict_texts,
+    max_batch_size=BATCH_MAX_SIZE,
+    max_wait_ms=BATCH_MAX_WAIT_MS
+)
+
+# =====================================================
+# INFERENCE FUNCTION (STANDARDIZED OUTPUT)
+# =====================================================
+def analyze_text(text: str):
+    """
+    Perform sentiment + stress inference on input text.
+
+    Cached texts return immediately; the rest are micro-batched with
+    concurrent calls into one model call.
+    Returns standardized JSON-safe dict
+    compatible with fusion & UI layers.
+    """
+    return _cached([text], lambda missing: [_batcher.submit(missing[0])])[0]
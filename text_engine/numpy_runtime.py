@@ -0,0 +1,416 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# =====================================================
+# PATHS
+# =====================================================
+MODEL_DIR = os.path.join(PROJECT_ROOT, "models", "sentiment")
+H5_PATH = os.path.join(MODEL_DIR, "sentiment_model.h5")
+NPZ_PATH = os.path.join(MODEL_DIR, "sentiment_model.npz")
+
+PREDICT_CHUNK = 512     # rows per forward pass (bounds embedding memory)
+
+
+def file_fingerprint(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+# =====================================================
+# ACTIVATIONS
+# =====================================================
+def _sigmoid(x):
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+def _activation(name, keras_major):
+    if name in ("linear", None):
+        return lambda x: x
+    if name == "relu":
+        return lambda x: np.maximum(x, 0)
+    if name == "sigmoid":
+        return _sigmoid
+    if name == "tanh":
+        return np.tanh
+    if name == "softmax":
+        return _softmax
+    if name == "hard_sigmoid":
+        # Definition changed between tf.keras 2 and Keras 3
+        if keras_major >= 3:
+            return lambda x: np.clip(x / 6.0 + 0.5, 0.0, 1.0)
+        return lambda x: np.clip(0.2 * x + 0.5, 0.0, 1.0)
+    raise ValueError(f"Unsupported activation '{name}'")
+
+# =====================================================
+# LAYER INTERPRETERS
+# =====================================================
+# Each takes (spec, weights, x, mask) and returns (x, mask).
+# mask is a bool (N, T) array for sequence tensors, or None.
+
+def _embedding(spec, w, x, mask):
+    ids = x.astype(np.int64)
+    out = w[0][ids]
+    return out, (ids != 0) if spec["mask_zero"] else None
+
+
+def _identity(spec, w, x, mask):
+    return x, mask
+
+
+def _flatten(spec, w, x, mask):
+    return x.reshape(len(x), -1), None
+
+
+def _dense(spec, w, x, mask):
+    out = x @ w[0]
+    if spec["use_bias"]:
+        out = out + w[1]
+    return spec["act"](out), mask
+
+
+def _global_avg_pool(spec, w, x, mask):
+    if mask is None:
+        return x.mean(axis=1), None
+    m = mask[..., None].astype(x.dtype)
+    return (x * m).sum(axis=1) / np.maximum(m.sum(axis=1), 1.0), None
+
+
+def _global_max_pool(spec, w, x, mask):
+    return x.max(axis=1), None
+
+
+def _pool1d(reduce):
+    def run(spec, w, x, mask):
+        size, stride = spec["pool_size"], spec["strides"]
+        windows = np.lib.stride_tricks.sliding_window_view(x, size, axis=1)[:, ::stride]
+        return reduce(windows, axis=-1), None
+    return run
+
+
+def _conv1d(spec, w, x, mask):
+    k = w[0].shape[0]
+    d, stride = spec["dilation_rate"], spec["strides"]
+    span = (k - 1) * d + 1
+
+    if spec["padding"] == "same":
+        total = span - 1
+        x = np.pad(x, ((0, 0), (total // 2, total - total // 2), (0, 0)))
+    elif spec["padding"] == "causal":
+        x = np.pad(x, ((0, 0), (span - 1, 0), (0, 0)))
+
+    windows = np.lib.stride_tricks.sliding_window_view(x, span, axis=1)
+    windows = windows[:, ::stride, :, ::d]             # (N, T', C, k)
+    out = np.einsum("ntck,kcf->ntf", windows, w[0])
+    if spec["use_bias"]:
+        out = out + w[1]
+    return spec["act"](out), None
+
+
+def _run_rnn(spec, step, xw, mask, units, state_count):
+    """
+    Unroll `step` over time. xw is the input projection, hoisted out of
+    the loop as one matmul; masked (padding) steps carry state through.
+    """
+    n, t, _ = xw.shape
+    states = [np.zeros((n, units), dtype=xw.dtype) for _ in range(state_count)]
+    order = range(t - 1, -1, -1) if spec["go_backwards"] else range(t)
+    outputs = []
+
+    for i in order:
+        new = step(xw[:, i], states)
+        if mask is not None:
+            keep = mask[:, i][:, None]
+            new = [np.where(keep, a, b) for a, b in zip(new, states)]
+            outputs.append(np.where(keep, new[0], 0.0))
+        else:
+            outputs.append(new[0])
+        states = new
+
+    if spec["return_sequences"]:
+        return np.stack(outputs, axis=1), mask
+    return states[0], None
+
+
+def _lstm(spec, w, x, mask):
+    kernel, recurrent = w[0], w[1]
+    bias = w[2] if spec["use_bias"] else 0.0
+    u = recurrent.shape[0]
+    act, rec_act = spec["act"], spec["rec_act"]
+
+    def step(xz, states):
+        h, c = states
+        z = xz + h @ recurrent
+        i = rec_act(z[:, :u])
+        f = rec_act(z[:, u:2 * u])
+        c_new = f * c + i * act(z[:, 2 * u:3 * u])
+        o = rec_act(z[:, 3 * u:])
+        return [o * act(c_new), c_new]
+
+    return _run_rnn(spec, step, x @ kernel + bias, mask, u, 2)
+
+
+def _gru(spec, w, x, mask):
+    kernel, recurrent = w[0], w[1]
+    u = recurrent.shape[0]
+    act, rec_act = spec["act"], spec["rec_act"]
+
+    if spec["use_bias"]:
+        bias = w[2]
+        in_bias, rec_bias = (bias[0], bias[1]) if bias.ndim == 2 else (bias, 0.0)
+    else:
+        in_bias, rec_bias = 0.0, 0.0
+
+    def step(xz, states):
+        (h,) = states
+        if spec["reset_after"]:
+            hr = h @ recurrent + rec_bias
+            z = rec_act(xz[:, :u] + hr[:, :u])
+            r = rec_act(xz[:, u:2 * u] + hr[:, u:2 * u])
+            hh = act(xz[:, 2 * u:] + r * hr[:, 2 * u:])
+        else:
+            z = rec_act(xz[:, :u] + h @ recurrent[:, :u])
+            r = rec_act(xz[:, u:2 * u] + h @ recurrent[:, u:2 * u])
+            hh = act(xz[:, 2 * u:] + (r * h) @ recurrent[:, 2 * u:])
+        return [z * h + (1.0 - z) * hh]
+
+    return _run_rnn(spec, step, x @ kernel + in_bias, mask, u, 1)
+
+
+def _bidirectional(spec, w, x, mask):
+    forward_spec, backward_spec = spec["forward"], spec["backward"]
+    half = len(w) // 2
+
+    fwd, _ = LAYERS[forward_spec["class"]](forward_spec, w[:half], x, mask)
+    bwd, _ = LAYERS[backward_spec["class"]](backward_spec, w[half:], x, mask)
+
+    if spec["return_sequences"]:
+        bwd = bwd[:, ::-1]
+
+    mode = spec["merge_mode"]
+    if mode == "concat":
+        out = np.concatenate([fwd, bwd], axis=-1)
+    elif mode == "sum":
+        out = fwd + bwd
+    elif mode == "ave":
+        out = (fwd + bwd) / 2
+    elif mode == "mul":
+        out = fwd * bwd
+    else:
+        raise ValueError(f"Unsupported merge_mode '{mode}'")
+
+    return out, (mask if spec["return_sequences"] else None)
+
+
+LAYERS = {
+    "Embedding": _embedding,
+    "Dropout": _identity,
+    "SpatialDropout1D": _identity,
+    "Activation": lambda spec, w, x, mask: (spec["act"](x), mask),
+    "Flatten": _flatten,
+    "Dense": _dense,
+    "GlobalAveragePooling1D": _global_avg_pool,
+    "GlobalMaxPooling1D": _global_max_pool,
+    "MaxPooling1D": _pool1d(np.max),
+    "AveragePooling1D": _pool1d(np.mean),
+    "Conv1D": _conv1d,
+    "LSTM": _lstm,
+    "GRU": _gru,
+    "Bidirectional": _bidirectional,
+}
+
+# =====================================================
+# EXPORTER (NEEDS TENSORFLOW, RUN ONCE)
+# =====================================================
+def _spec(layer):
+    """
+    The config fields the interpreter needs, as plain JSON.
+    """
+    name = type(layer).__name__
+    if name not in LAYERS:
+        raise ValueError(f"Layer '{layer.name}' ({name}) is not supported by the NumPy runtime")
+
+    config = layer.get_config()
+    spec = {"class": name, "name": layer.name}
+
+    if name == "Embedding":
+        spec["mask_zero"] = bool(config.get("mask_zero", False))
+    elif name in ("Dense", "Activation", "Conv1D"):
+        spec["activation"] = config.get("activation", "linear")
+        spec["use_bias"] = bool(config.get("use_bias", True))
+        if name == "Conv1D":
+            spec["padding"] = config["padding"]
+            spec["strides"] = int(np.ravel(config["strides"])[0])
+            spec["dilation_rate"] = int(np.ravel(config["dilation_rate"])[0])
+            if config.get("data_format", "channels_last") != "channels_last":
+                raise ValueError("Conv1D must be channels_last")
+    elif name in ("MaxPooling1D", "AveragePooling1D"):
+        if config["padding"] != "valid":
+            raise ValueError(f"{name} padding '{config['padding']}' not supported")
+        spec["pool_size"] = int(np.ravel(config["pool_size"])[0])
+        spec["strides"] = int(np.ravel(config["strides"] or config["pool_size"])[0])
+    elif name in ("LSTM", "GRU"):
+        spec["activation"] = config["activation"]
+        spec["recurrent_activation"] = config["recurrent_activation"]
+        spec["use_bias"] = bool(config["use_bias"])
+        spec["return_sequences"] = bool(config["return_sequences"])
+        spec["go_backwards"] = bool(config.get("go_backwards", False))
+        if name == "GRU":
+            spec["reset_after"] = bool(config.get("reset_after", True))
+    elif name == "Bidirectional":
+        spec["merge_mode"] = config.get("merge_mode", "concat")
+        spec["forward"] = _spec(layer.forward_layer)
+        spec["backward"] = _spec(layer.backward_layer)
+        spec["return_sequences"] = spec["forward"]["return_sequences"]
+
+    return spec
+
+
+def export(h5_path: str = H5_PATH, npz_path: str = NPZ_PATH):
+    """
+    Dump a sequential Keras model's layer specs + weights to .npz.
+    """
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(h5_path)
+    layers = [l for l in model.layers if type(l).__name__ != "InputLayer"]
+
+    specs, arrays = [], {}
+    for i, layer in enumerate(layers):
+        spec = _spec(layer)
+        weights = layer.get_weights()
+        spec["weights"] = len(weights)
+        for j, value in enumerate(weights):
+            arrays[f"w{i}_{j}"] = np.asarray(value, dtype=np.float32)
+        specs.append(spec)
+
+    keras_version = getattr(tf.keras, "__version__", None) or tf.__version__
+    np.savez(
+        npz_path,
+        layers=np.array(json.dumps(specs)),
+        keras_major=np.array(int(str(keras_version).split(".")[0])),
+        fingerprint=np.array(file_fingerprint(h5_path)),
+        **arrays
+    )
+    return [s["class"] for s in specs]
+
+# =====================================================
+# NUMPY MODEL
+# =====================================================
+class NumpySentimentModel:
+    """
+    TensorFlow-free forward pass over an exported .npz.
+
+    predict(x, verbose=0) matches the Keras call used by
+    text_engine.inference, so it drops into the model registry.
+    """
+
+    def __init__(self, specs, weights, keras_major, fingerprint=None):
+        self.specs = specs
+        self.weights = weights
+        self.fingerprint = fingerprint
+        for spec in self._all_specs():
+            self._bind(spec, keras_major)
+
+    @classmethod
+    def load(cls, path: str = NPZ_PATH):
+        data = np.load(path, allow_pickle=False)
+        specs = json.loads(str(data["layers"]))
+        weights = [
+            [data[f"w{i}_{j}"] for j in range(spec["weights"])]
+            for i, spec in enumerate(specs)
+        ]
+        return cls(specs, weights, int(data["keras_major"]), str(data["fingerprint"]))
+
+    def _all_specs(self):
+        for spec in self.specs:
+            yield spec
+            if spec["class"] == "Bidirectional":
+                yield spec["forward"]
+                yield spec["backward"]
+
+    @staticmethod
+    def _bind(spec, keras_major):
+        if "activation" in spec:
+            spec["act"] = _activation(spec["activation"], keras_major)
+        if "recurrent_activation" in spec:
+            spec["rec_act"] = _activation(spec["recurrent_activation"], keras_major)
+
+    def forward(self, x):
+        mask = None
+        for spec, weights in zip(self.specs, self.weights):
+            x, mask = LAYERS[spec["class"]](spec, weights, x, mask)
+        return x
+
+    def predict(self, x, verbose=0):
+        x = np.asarray(x)
+        if len(x) <= PREDICT_CHUNK:
+            return self.forward(x)
+        return np.concatenate([
+            self.forward(x[i:i + PREDICT_CHUNK])
+            for i in range(0, len(x), PREDICT_CHUNK)
+        ])
+
+# =====================================================
+# PARITY CHECK (NEEDS TENSORFLOW)
+# =====================================================
+def verify(h5_path: str = H5_PATH, npz_path: str = NPZ_PATH, rows: int = 512, seed: int = 0):
+    """
+    Compare NumPy and Keras outputs on random + real encoded texts.
+    Returns the max absolute difference; raises AssertionError on drift.
+    """
+    import tensorflow as tf
+    from text_engine.inference import MAX_LEN, VOCAB_SIZE, _build_result, encode_texts
+
+    keras_model = tf.keras.models.load_model(h5_path)
+    numpy_model = NumpySentimentModel.load(npz_path)
+
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(1, MAX_LEN + 1, rows)
+    X = rng.integers(1, VOCAB_SIZE, (rows, MAX_LEN)).astype(np.int32)
+    X[np.arange(MAX_LEN)[None, :] >= lengths[:, None]] = 0
+
+    X = np.vstack([X, encode_texts([
+        "i feel great today",
+        "i am so stressed and anxious i cannot sleep",
+        "",
+        "the movie was terrible and boring " * 40
+    ])])
+
+    expected = keras_model.predict(X, verbose=0)
+    actual = numpy_model.predict(X)
+
+    diff = float(np.abs(expected - actual).max())
+    assert diff < 1e-4, f"max abs diff {diff}"
+    assert [_build_result(float(s)) for s in expected[:, 0]] == \
+           [_build_result(float(s)) for s in actual[:, 0]], "results differ"
+    return diff
+
+# =====================================================
+# CLI
+# =====================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export the Keras sentiment model for the NumPy runtime."
+    )
+    parser.add_argument("--verify", action="store_true",
+                        help="Only run the Keras parity check")
+    args = parser.parse_args()
+
+    if not args.verify:
+        layers = export()
+        print(f"✅ NumPy model saved: {NPZ_PATH} ({' → '.join(layers)})")
+
+    print(f"✅ NumPy runtime matches Keras (max abs diff {verify():.2e})")
@@ -0,0 +1,320 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from text_engine.numpy_runtime import H5_PATH, MODEL_DIR, NPZ_PATH, file_fingerprint
+
+# =====================================================
+# PATHS / CONFIG
+# =====================================================
+TFLITE_PATH = os.path.join(MODEL_DIR, "sentiment_model.tflite")
+
+# One interpreter per batch size, tensors allocated once.
+# A batch uses the smallest bucket that fits; bigger ones are chunked.
+BUCKETS = tuple(sorted({
+    int(b) for b in os.environ.get("TFLITE_BUCKETS", "1,8,32").split(",") if b.strip()
+}))
+NUM_THREADS = int(os.environ.get("TFLITE_THREADS", 1))
+
+REPRESENTATIVE_SAMPLES = 500
+MODES = ("dynamic", "int8")
+
+
+def _interpreter_class():
+    # The standalone tflite-runtime wheel avoids TensorFlow entirely
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+# =====================================================
+# INTERPRETER BACKEND
+# =====================================================
+class _Slot:
+    def __init__(self, interpreter, size):
+        self.interpreter = interpreter
+        self.size = size
+        self.lock = threading.Lock()
+
+        inp = interpreter.get_input_details()[0]
+        out = interpreter.get_output_details()[0]
+        self.input_index = inp["index"]
+        self.input_dtype = inp["dtype"]
+        self.output_index = out["index"]
+        self.output_scale, self.output_zero = out["quantization"]
+        self.output_quantized = out["dtype"] in (np.int8, np.uint8)
+
+
+class TFLiteSentimentModel:
+    """
+    Quantized sentiment model behind the Keras predict(x, verbose=0) call.
+
+    Input/output tensors are allocated once per bucket and written /
+    read in place on every call; a lock per bucket keeps concurrent
+    request threads off the same interpreter.
+    """
+
+    def __init__(self, path: str = TFLITE_PATH, buckets=BUCKETS, num_threads: int = NUM_THREADS):
+        with open(path, "rb") as f:
+            self._content = f.read()
+
+        Interpreter = _interpreter_class()
+
+        self.meta = {}
+        if os.path.exists(path + ".json"):
+            with open(path + ".json") as f:
+                self.meta = json.load(f)
+
+        self._slots = []
+        for size in buckets:
+            interpreter = Interpreter(model_content=self._content, num_threads=num_threads)
+            inp = interpreter.get_input_details()[0]
+            interpreter.resize_tensor_input(inp["index"], [size, int(inp["shape"][1])])
+            interpreter.allocate_tensors()
+            self._slots.append(_Slot(interpreter, size))
+
+        out = self._slots[0].interpreter.get_output_details()[0]
+        self.output_dim = int(out["shape"][-1])
+
+    @property
+    def fingerprint(self):
+        return self.meta.get("fingerprint")
+
+    def _slot_for(self, n: int) -> _Slot:
+        for slot in self._slots:
+            if slot.size >= n:
+                return slot
+        return self._slots[-1]
+
+    def _run(self, slot: _Slot, rows: np.ndarray, out: np.ndarray):
+        n = len(rows)
+        interpreter = slot.interpreter
+
+        with slot.lock:
+            # Views into interpreter memory must be dropped before invoke()
+            buffer = interpreter.tensor(slot.input_index)()
+            buffer[:n] = rows
+            buffer[n:] = 0
+            del buffer
+
+            interpreter.invoke()
+
+            result = interpreter.tensor(slot.output_index)()
+            if slot.output_quantized:
+                out[:] = (result[:n].astype(np.float32) - slot.output_zero) * slot.output_scale
+            else:
+                out[:] = result[:n]
+            del result
+
+    def predict(self, x, verbose=0):
+        x = np.asarray(x)
+        out = np.empty((len(x), self.output_dim), dtype=np.float32)
+
+        start = 0
+        while start < len(x):
+            slot = self._slot_for(len(x) - start)
+            stop = min(start + slot.size, len(x))
+            self._run(slot, x[start:stop].astype(slot.input_dtype, copy=False), out[start:stop])
+            start = stop
+
+        return out
+
+# =====================================================
+# REPRESENTATIVE / EVALUATION TEXTS
+# =====================================================
+def imdb_texts(samples: int, split: str = "train", seed: int = 0):
+    """
+    IMDB reviews decoded back to words, so they go through the same
+    tokenizer + vocabulary as served text. Returns (texts, labels).
+    """
+    from tensorflow.keras.datasets import imdb
+    from text_engine.inference import VOCAB_SIZE
+
+    (x_train, y_train), (x_test, y_test) = imdb.load_data(num_words=VOCAB_SIZE)
+    x, y = (x_train, y_train) if split == "train" else (x_test, y_test)
+
+    # load_data shifts word ids by 3 (0 pad, 1 start, 2 OOV)
+    words = {idx + 3: word for word, idx in imdb.get_word_index().items()}
+    pick = np.random.default_rng(seed).permutation(len(x))[:samples]
+
+    texts = [
+        " ".join(words.get(i, "<oov>") for i in x[j] if i > 2)
+        for j in pick
+    ]
+    return texts, np.asarray(y)[pick]
+
+
+def file_texts(path: str, samples: int):
+    with open(path, encoding="utf-8") as f:
+        texts = [line.strip() for line in f if line.strip()]
+    return texts[:samples], None
+
+# =====================================================
+# CONVERTER (NEEDS TENSORFLOW)
+# =====================================================
+def convert(
+    mode: str = "dynamic",
+    samples: int = REPRESENTATIVE_SAMPLES,
+    texts_path: str = None,
+    h5_path: str = H5_PATH,
+    out_path: str = TFLITE_PATH
+) -> dict:
+    """
+    Quantize the Keras model to TFLite.
+
+    dynamic → int8 weights, float activations (no calibration data)
+    int8    → int8 weights + activations calibrated on encoded texts;
+              ops without int8 kernels fall back to float
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}")
+
+    import tensorflow as tf
+    from text_engine.inference import encode_texts
+
+    model = tf.keras.models.load_model(h5_path)
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+    if mode == "int8":
+        texts, _ = file_texts(texts_path, samples) if texts_path else imdb_texts(samples)
+        # tf.keras gives a tf.DType, Keras 3 a dtype string
+        input_dtype = model.inputs[0].dtype
+        X = encode_texts(texts).astype(np.dtype(getattr(input_dtype, "as_numpy_dtype", input_dtype)))
+
+        def representative_dataset():
+            for row in X:
+                yield [row[None, :]]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [
+            tf.lite.OpsSet.TFLITE_BUILTINS_INT8,
+            tf.lite.OpsSet.TFLITE_BUILTINS
+        ]
+
+    content = converter.convert()
+
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, out_path)
+
+    meta = {
+        "fingerprint": file_fingerprint(h5_path),
+        "mode": mode,
+        "representative_samples": samples if mode == "int8" else 0,
+        "size_bytes": len(content),
+        "tensorflow_version": tf.__version__
+    }
+    with open(out_path + ".json", "w") as f:
+        json.dump(meta, f, indent=2)
+
+    return meta
+
+# =====================================================
+# REPORT: LATENCY / SIZE / ACCURACY DRIFT
+# =====================================================
+def _latency(model, X, repeats):
+    model.predict(X, verbose=0)
+
+    samples = []
+    for _ in range(repeats):
+        t = time.perf_counter()
+        model.predict(X, verbose=0)
+        samples.append(time.perf_counter() - t)
+
+    return {
+        "p50_ms": round(float(np.percentile(samples, 50)) * 1000, 3),
+        "p99_ms": round(float(np.percentile(samples, 99)) * 1000, 3),
+    }
+
+
+def _size(path):
+    return os.path.getsize(path) if os.path.exists(path) else None
+
+
+def report(samples: int = 1000, texts_path: str = None, repeats: int = 100) -> dict:
+    """
+    Float Keras model vs the TFLite export (and the NumPy export if
+    present) on held-out texts.
+    """
+    import tensorflow as tf
+    from text_engine.inference import BATCH_MAX_SIZE, _build_result, encode_texts
+    from text_engine.numpy_runtime import NumpySentimentModel
+
+    texts, labels = file_texts(texts_path, samples) if texts_path else imdb_texts(samples, "test")
+    X = encode_texts(texts)
+
+    backends = {
+        "keras": tf.keras.models.load_model(H5_PATH),
+        "tflite": TFLiteSentimentModel(),
+    }
+    if os.path.exists(NPZ_PATH):
+        backends["numpy"] = NumpySentimentModel.load(NPZ_PATH)
+
+    reference = backends["keras"].predict(X, verbose=0)[:, 0]
+    reference_risk = [_build_result(float(s))["risk_level"] for s in reference]
+
+    out = {
+        "mode": backends["tflite"].meta.get("mode"),
+        "texts": len(texts),
+        "size_bytes": {"keras": _size(H5_PATH), "tflite": _size(TFLITE_PATH), "numpy": _size(NPZ_PATH)},
+        "backends": {}
+    }
+
+    for name, model in backends.items():
+        scores = model.predict(X, verbose=0)[:, 0]
+        risk = [_build_result(float(s))["risk_level"] for s in scores]
+
+        entry = {
+            "single_text": _latency(model, X[:1], repeats),
+            f"batch_{BATCH_MAX_SIZE}": _latency(model, X[:BATCH_MAX_SIZE], max(repeats // 4, 5)),
+            "max_abs_diff": round(float(np.abs(scores - reference).max()), 6),
+            "mean_abs_diff": round(float(np.abs(scores - reference).mean()), 6),
+            "sentiment_agreement": round(float(np.mean((scores >= 0.5) == (reference >= 0.5))), 5),
+            "risk_agreement": round(float(np.mean([a == b for a, b in zip(risk, reference_risk)])), 5),
+        }
+        if labels is not None:
+            entry["accuracy"] = round(float(np.mean((scores >= 0.5) == (labels == 1))), 5)
+        out["backends"][name] = entry
+
+    return out
+
+# =====================================================
+# CLI
+# =====================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Quantize the sentiment model to TFLite and report the trade-off."
+    )
+    parser.add_argument("--mode", choices=MODES, default="dynamic")
+    parser.add_argument("--samples", type=int, default=REPRESENTATIVE_SAMPLES,
+                        help="representative texts for int8 calibration")
+    parser.add_argument("--texts", help="one text per line (default: IMDB reviews)")
+    parser.add_argument("--report-only", action="store_true",
+                        help="skip conversion, compare the existing .tflite")
+    parser.add_argument("--report-samples", type=int, default=1000)
+    parser.add_argument("--out", help="also write the report JSON here")
+    args = parser.parse_args()
+
+    if not args.report_only:
+        meta = convert(args.mode, args.samples, args.texts)
+        print(f"✅ TFLite model saved: {TFLITE_PATH} ({meta['mode']}, {meta['size_bytes']} bytes)")
+
+    result = report(args.report_samples, args.texts)
+    print(json.dumps(result, indent=2))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
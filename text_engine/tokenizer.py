@@ -0,0 +1,61 @@
+from itertools import chain, islice
+from typing import Iterable, Iterator, List
+
+import numpy as np
+
+from instrumentation import stage
+from text_engine.vocab import OOV_INDEX, VocabIndex
+
+# =====================================================
+# VECTORIZED BATCH ENCODER
+# =====================================================
+def encode_texts(texts: List[str], vocab: VocabIndex, max_len: int) -> np.ndarray:
+    """
+    Encode many texts at once into an int32 (N, max_len) matrix.
+
+    Matches pad_sequences(padding="post", truncating="post") on the
+    per-text encoding: tokens are truncated to max_len, padded with 0,
+    and an empty text becomes a single OOV token.
+    """
+    n = len(texts)
+    out = np.zeros((n, max_len), dtype=np.int32)
+    if n == 0 or max_len <= 0:
+        return out
+
+    with stage("tokenize"):
+        # Truncate before lookup so long texts cost at most max_len tokens
+        tokens = [text.lower().split()[:max_len] for text in texts]
+        lengths = np.fromiter((len(t) for t in tokens), dtype=np.int64, count=n)
+
+        flat = list(chain.from_iterable(tokens))
+        ids = vocab.lookup(flat)
+
+    with stage("pad"):
+        # Scatter every token into its (row, column) slot in one shot
+        rows = np.repeat(np.arange(n), lengths)
+        starts = np.cumsum(lengths) - lengths
+        cols = np.arange(len(flat)) - np.repeat(starts, lengths)
+        out[rows, cols] = ids
+
+        out[lengths == 0, 0] = OOV_INDEX
+
+    return out
+
+# =====================================================
+# STREAMING ENCODER
+# =====================================================
+def iter_encoded(
+    texts: Iterable[str],
+    vocab: VocabIndex,
+    max_len: int,
+    chunk_size: int = 1024
+) -> Iterator[np.ndarray]:
+    """
+    Encode an arbitrarily long text stream in fixed-size chunks.
+    """
+    it = iter(texts)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield encode_texts(chunk, vocab, max_len)
@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import pickle
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# =====================================================
+# PATHS (MATCH CURRENT PROJECT STRUCTURE)
+# =====================================================
+BASE_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+MODEL_DIR = os.path.join(PROJECT_ROOT, "models", "sentiment")
+
+CONFIG_PATH = os.path.join(MODEL_DIR, "preprocess_config.pkl")
+KEYS_PATH = os.path.join(MODEL_DIR, "vocab_keys.npy")
+IDS_PATH = os.path.join(MODEL_DIR, "vocab_ids.npy")
+META_PATH = KEYS_PATH + ".json"
+
+OOV_INDEX = 2
+
+# =====================================================
+# MEMORY-MAPPED VOCABULARY
+# =====================================================
+class VocabIndex:
+    """
+    Sorted string table over the truncated IMDB word index.
+
+    `keys` is a sorted fixed-width bytes array and `ids` the matching
+    word ids. Both are memory-mapped read-only, so every gunicorn
+    worker shares the same page-cache copy instead of building its
+    own ~88k-entry dict.
+    """
+
+    def __init__(self, keys_path: str = KEYS_PATH, ids_path: str = IDS_PATH):
+        self.keys = np.load(keys_path, mmap_mode="r")
+        self.ids = np.load(ids_path, mmap_mode="r")
+        self.width = self.keys.dtype.itemsize
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, words: List[str]) -> np.ndarray:
+        """
+        Map words → int32 ids, unknown words → OOV_INDEX.
+        """
+        if not words or not len(self.keys):
+            return np.full(len(words), OOV_INDEX, dtype=np.int32)
+
+        # Resolve each distinct word once, then gather per token
+        unique = list(dict.fromkeys(words))
+        ids = dict(zip(unique, self._search(unique).tolist()))
+
+        return np.fromiter(
+            map(ids.__getitem__, words),
+            dtype=np.int32,
+            count=len(words)
+        )
+
+    def _search(self, words: List[str]) -> np.ndarray:
+        out = np.full(len(words), OOV_INDEX, dtype=np.int32)
+        encoded = [w.encode("utf-8") for w in words]
+
+        # Words wider than the table (or with NULs, which the bytes
+        # dtype strips) can never match, and must not be truncated
+        # into a false hit
+        valid = np.fromiter(
+            (len(w) <= self.width and b"\0" not in w for w in encoded),
+            dtype=bool,
+            count=len(encoded)
+        )
+
+        query = np.array(
+            [w if ok else b"" for w, ok in zip(encoded, valid)],
+            dtype=self.keys.dtype
+        )
+
+        pos = np.searchsorted(self.keys, query)
+        pos = np.minimum(pos, len(self.keys) - 1)
+
+        hit = valid & (self.keys[pos] == query)
+        out[hit] = self.ids[pos[hit]]
+
+        return out
+
+# =====================================================
+# BUILD STEP
+# =====================================================
+def build_vocab_index(
+    vocab_size: int,
+    word_index: Optional[Dict[str, int]] = None,
+    keys_path: str = KEYS_PATH,
+    ids_path: str = IDS_PATH
+):
+    """
+    Compile the IMDB word index (truncated to `vocab_size`)
+    into the on-disk sorted string table, plus a JSON sidecar
+    recording the `vocab_size` it was built for.
+    """
+    if word_index is None:
+        from tensorflow.keras.datasets import imdb
+        word_index = imdb.get_word_index()
+
+    kept = sorted(
+        (word.encode("utf-8"), idx)
+        for word, idx in word_index.items()
+        if idx < vocab_size
+    )
+
+    width = max((len(w) for w, _ in kept), default=1)
+
+    keys = np.array([w for w, _ in kept], dtype=f"S{width}")
+    ids = np.array([i for _, i in kept], dtype=np.int32)
+
+    # Atomic replace so concurrent workers never map a partial file
+    for path, array in ((keys_path, keys), (ids_path, ids)):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+
+    with open(keys_path + ".json", "w") as f:
+        json.dump({"vocab_size": vocab_size, "entries": len(keys)}, f, indent=2)
+
+    return len(keys)
+
+
+def load_vocab_index(vocab_size: int) -> VocabIndex:
+    """
+    Open the prebuilt vocabulary. Never builds it here: that needs
+    TensorFlow and the IMDB download, which must not happen at startup.
+    """
+    if not all(os.path.exists(p) for p in (KEYS_PATH, IDS_PATH, META_PATH)):
+        raise RuntimeError(
+            f"Vocabulary table not found in {MODEL_DIR} — "
+            "run: python -m text_engine.vocab"
+        )
+
+    with open(META_PATH) as f:
+        built_for = json.load(f).get("vocab_size")
+
+    if built_for != vocab_size:
+        raise RuntimeError(
+            f"Vocabulary table was built for vocab_size={built_for}, "
+            f"model expects {vocab_size} — run: python -m text_engine.vocab"
+        )
+
+    return VocabIndex()
+
+# =====================================================
+# CLI
+# =====================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compile the IMDB word index into a memory-mappable table."
+    )
+    parser.add_argument(
+        "--word-index",
+        help="Path to imdb_word_index.json (default: keras download/cache)"
+    )
+    args = parser.parse_args()
+
+    with open(CONFIG_PATH, "rb") as f:
+        config = pickle.load(f)
+
+    word_index = None
+    if args.word_index:
+        with open(args.word_index, encoding="utf-8") as f:
+            word_index = json.load(f)
+
+    count = build_vocab_index(config["vocab_size"], word_index)
+
+    print(f"✅ Vocabulary index built: {count} words")
+    print("Keys:", KEYS_PATH)
+    print("Ids:", IDS_PATH)
+    print("Meta:", META_PATH)
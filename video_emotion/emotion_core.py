@@ -1,7 +1,11 @@
+import os
 import time
 import numpy as np
-from fer import FER
-from collections import defaultdict
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional
+
+from instrumentation import is_enabled, stage
+from model_registry import registry
 
 # ================= CONFIG =================
 ANALYSIS_SECONDS = 15
@@ -11,54 +15,262 @@ MIN_EMOTION_SAMPLES = 20
 NEGATIVE_EMOTIONS = {"sad", "angry", "fear", "disgust"}
 POSITIVE_EMOTIONS = {"happy", "surprise"}
 
+EWMA_ALPHA = 0.2        # weight of the newest frame in rolling averages
+MODE_WINDOW = 7         # frames in the sliding dominant-emotion window
+
+# Profiling only: time FER face detection and classification separately
+SPLIT_DETECTOR_TIMING = os.environ.get(
+    "METRICS_SPLIT_DETECTOR", "0"
+).lower() in ("1", "true", "yes")
+
 # 🚨 IMPORTANT FIX:
 # Core logic MUST NOT use MTCNN
 # Face detection already happens in UI layer
-detector = FER(mtcnn=False)
+def _load_detector():
+    from fer import FER
+    return FER(mtcnn=False)
+
+
+def _warmup_detector(detector):
+    detector.detect_emotions(np.zeros((120, 120, 3), dtype=np.uint8))
+
+
+# One FER instance per process, shared with the Streamlit UI layer
+registry.register("fer_detector", _load_detector, warmup=_warmup_detector)
+
+
+def get_detector():
+    return registry.get("fer_detector")
+
+
+def run_detector(detector, frame):
+    """
+    detector.detect_emotions(frame), timed as one "detect_emotions"
+    stage when metrics are on.
+
+    METRICS_SPLIT_DETECTOR=1 (opt-in, for profiling) instead runs FER's
+    find_faces() and detect_emotions(face_rectangles=) separately, so
+    face detection and the emotion CNN are timed as their own stages.
+    """
+    if not is_enabled():
+        return detector.detect_emotions(frame)
+
+    # Wrappers (tracking mode) and stand-ins: always the single call
+    if not SPLIT_DETECTOR_TIMING or not hasattr(detector, "find_faces"):
+        with stage("detect_emotions"):
+            return detector.detect_emotions(frame)
+
+    with stage("face_detect"):
+        faces = detector.find_faces(frame, bgr=True)
+    with stage("emotion_classify"):
+        return detector.detect_emotions(frame, face_rectangles=faces)
+
+# ================= FRAME RECORD =================
+class FrameDetections(NamedTuple):
+    """
+    A frame plus the FER detections already computed for it.
+
+    Frame sources that run detection themselves (e.g. for the UI
+    overlay) yield these so analyze_frames does not detect twice.
+    """
+    frame: np.ndarray
+    detections: List[dict]
+
+# ================= DETECTION =================
+def detect_item(item, detector=None):
+    """
+    Detections for a raw frame or FrameDetections record.
+    Returns None if FER fails on the frame.
+    """
+    if isinstance(item, FrameDetections):
+        return item.detections
+    try:
+        return run_detector(detector or get_detector(), item)
+    except Exception:
+        return None
 
 # ================= CORE FUNCTION =================
-def analyze_frames(frame_generator):
+def analyze_frames(
+    frame_generator,
+    max_seconds=ANALYSIS_SECONDS,
+    min_samples=MIN_EMOTION_SAMPLES,
+    detector=None
+):
     """
     Analyze emotions from a stream of frames.
     Frame source is controlled externally (Streamlit).
+
+    Items may be raw frames or FrameDetections records; precomputed
+    detections are used as-is instead of re-running FER.
+
+    `max_seconds` (wall-clock budget) and `min_samples` (early exit)
+    can be set to None to consume the whole stream, e.g. a video file.
+
+    `detector` overrides the shared FER instance for raw frames, e.g.
+    a tracking.TrackedEmotionDetector.
+    """
+    return run_analysis(
+        frame_generator,
+        lambda item: detect_item(item, detector),
+        max_seconds,
+        min_samples
+    )
+
+
+def run_analysis(items, resolve, max_seconds, min_samples):
+    """
+    Shared analysis loop. `resolve(item)` returns the detections for
+    each item (None on failure); it is called only for items inside
+    the time budget, so sequential and parallel modes stop identically.
     """
+    aggregator = EmotionAggregator()
 
-    emotion_scores = defaultdict(list)
-    total_frames = 0
-    valid_frames = 0
+    for item in items:
 
-    start_time = time.time()
+        if max_seconds is not None and aggregator.elapsed() >= max_seconds:
+            break
 
-    for frame in frame_generator:
+        # None (FER failure) and [] (no face) only count as frames
+        aggregator.add(resolve(item))
 
-        if time.time() - start_time >= ANALYSIS_SECONDS:
+        # Early exit if enough emotion evidence collected
+        if min_samples is not None and aggregator.samples >= min_samples:
             break
 
-        total_frames += 1
+    return aggregator.snapshot()
+
+# ================= STREAMING AGGREGATION =================
+class SlidingMode:
+    """
+    Most frequent label (and mean weight) over the last `window` pushes.
+
+    Counts are updated incrementally, so each push is O(1) instead of
+    rebuilding a Counter over the buffer.
+    """
+
+    def __init__(self, window: int = MODE_WINDOW):
+        self.labels = deque(maxlen=window)
+        self.weights = deque(maxlen=window)
+        self.counts: Dict[str, int] = {}
+        self.weight_sum = 0.0
+
+    def push(self, label: str, weight: float = 0.0):
+        if len(self.labels) == self.labels.maxlen:
+            oldest = self.labels[0]
+            self.counts[oldest] -= 1
+            if not self.counts[oldest]:
+                del self.counts[oldest]
+            self.weight_sum -= self.weights[0]
 
-        try:
-            detections = detector.detect_emotions(frame)
-        except Exception:
-            continue
+        self.labels.append(label)
+        self.weights.append(weight)
+        self.counts[label] = self.counts.get(label, 0) + 1
+        self.weight_sum += weight
 
+        return self.mode(), self.mean_weight()
+
+    def mode(self) -> Optional[str]:
+        if not self.counts:
+            return None
+        best = max(self.counts.values())
+        # Ties → earliest label in the window (Counter.most_common order)
+        for label in self.labels:
+            if self.counts[label] == best:
+                return label
+
+    def mean_weight(self) -> float:
+        return self.weight_sum / len(self.weights) if self.weights else 0.0
+
+    def clear(self):
+        self.labels.clear()
+        self.weights.clear()
+        self.counts.clear()
+        self.weight_sum = 0.0
+
+
+class EmotionAggregator:
+    """
+    Constant-memory running summary of per-frame FER detections.
+
+    Keeps per-emotion running sums/counts of above-threshold scores
+    (the cumulative summary analyze_frames reports), an exponentially
+    weighted moving average of every score (rolling state), and a
+    sliding-window mode of the top emotion. Suitable for continuous
+    monitoring where frames never stop.
+    """
+
+    def __init__(
+        self,
+        threshold: float = CONFIDENCE_THRESHOLD,
+        alpha: float = EWMA_ALPHA,
+        window: int = MODE_WINDOW
+    ):
+        self.threshold = threshold
+        self.alpha = alpha
+
+        self.sums: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.ewma: Dict[str, float] = {}
+        self.recent = SlidingMode(window)
+
+        self.samples = 0
+        self.total_frames = 0
+        self.valid_frames = 0
+        self.start_time = time.time()
+
+    def elapsed(self) -> float:
+        return time.time() - self.start_time
+
+    def add(self, detections: Optional[List[dict]]):
+        self.total_frames += 1
         if not detections:
-            continue
+            return
 
-        valid_frames += 1
+        self.valid_frames += 1
 
         # FER without MTCNN returns at most one face
         emotions = detections[0].get("emotions", {})
 
         for emotion, score in emotions.items():
-            if score >= CONFIDENCE_THRESHOLD:
-                emotion_scores[emotion].append(score)
+            if score >= self.threshold:
+                self.sums[emotion] = self.sums.get(emotion, 0.0) + score
+                self.counts[emotion] = self.counts.get(emotion, 0) + 1
+                self.samples += 1
 
-        # Early exit if enough emotion evidence collected
-        if sum(len(v) for v in emotion_scores.values()) >= MIN_EMOTION_SAMPLES:
-            break
+            previous = self.ewma.get(emotion, score)
+            self.ewma[emotion] = previous + self.alpha * (score - previous)
+
+        if emotions:
+            top = max(emotions, key=emotions.get)
+            self.recent.push(top, emotions[top])
 
+    def averages(self) -> Dict[str, float]:
+        return {e: self.sums[e] / self.counts[e] for e in self.sums}
+
+    def snapshot(self, rolling: bool = False) -> Dict:
+        """
+        Standardized summary. `rolling=True` scores the EWMA state
+        (recent frames) instead of the whole-session averages.
+        """
+        averaged = (
+            {e: v for e, v in self.ewma.items() if v > 0}
+            if rolling else self.averages()
+        )
+
+        summary = summarize(
+            averaged, self.total_frames, self.valid_frames, self.start_time
+        )
+        if summary["status"] == "success":
+            summary["recent_emotion"] = self.recent.mode()
+        return summary
+
+# ================= SUMMARY =================
+def summarize(averaged, total_frames, valid_frames, start_time):
+    """
+    Turn per-emotion average scores into the standardized summary.
+    """
     # ================= NO FACE CASE =================
-    if not emotion_scores:
+    if not averaged:
         return {
             "status": "no_face_detected",
             "message": "Face not detected clearly.",
@@ -66,11 +278,6 @@ def analyze_frames(frame_generator):
         }
 
     # ================= AGGREGATION =================
-    averaged = {
-        emotion: float(np.mean(scores))
-        for emotion, scores in emotion_scores.items()
-    }
-
     dominant_emotion = max(averaged, key=averaged.get)
     total_score = sum(averaged.values())
 
@@ -0,0 +1,186 @@
+import threading
+import time
+
+import cv2
+
+# ================= CONFIG =================
+SAMPLE_FPS = 4          # frames analyzed per second of video
+MAX_FRAME_WIDTH = 640   # downsize before detection
+
+# ================= HELPERS =================
+def downscale(frame, max_width=MAX_FRAME_WIDTH):
+    """
+    Shrink a frame to at most `max_width` pixels wide (aspect kept).
+    """
+    h, w = frame.shape[:2]
+    if not max_width or w <= max_width:
+        return frame
+
+    scale = max_width / w
+    return cv2.resize(
+        frame,
+        (max_width, int(round(h * scale))),
+        interpolation=cv2.INTER_AREA
+    )
+
+# ================= FILE SOURCE =================
+def video_file_frames(path, sample_fps=SAMPLE_FPS, max_width=MAX_FRAME_WIDTH):
+    """
+    Yield frames from a video file sampled at `sample_fps`.
+
+    Skipped frames are only grab()-bed (demuxed, never converted to
+    BGR), so the cost scales with the sample rate rather than the
+    source frame rate. Covers the whole clip.
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        return
+
+    source_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    step = max(1, int(round(source_fps / sample_fps)))
+
+    index = 0
+    try:
+        while cap.grab():
+            if index % step == 0:
+                ok, frame = cap.retrieve()
+                if ok and frame is not None:
+                    yield downscale(frame, max_width)
+            index += 1
+    finally:
+        cap.release()
+
+# ================= LIVE CAMERA SOURCE =================
+WEBCAM_SECONDS = 15       # length of a webcam session
+WEBCAM_INTERVAL = 0.3     # seconds between analyzed frames
+MIN_FRAME_SIZE = 100      # frames smaller than this (h or w) are dropped
+MAX_GRAB_FAILURES = 30    # consecutive failed grabs before giving up
+
+
+class LatestFrameCapture:
+    """
+    Camera reader with a single-slot, latest-frame buffer.
+
+    A daemon thread grab()s every camera frame (blocking on the device,
+    so no spinning, and the driver queue never backs up with stale
+    frames). A frame is only decoded when the analysis loop asks for
+    one, into two preallocated buffers that are swapped in place, so
+    slow detection never stalls capture and never sees an old frame.
+    """
+
+    def __init__(self, source=0):
+        self._cap = cv2.VideoCapture(source)
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+
+        self._back = None       # decode target (capture thread only)
+        self._front = None      # last delivered frame (under _cond)
+        self._seq = 0
+        self._wanted = False
+        self.alive = self._cap.isOpened()
+        self.stats = {"grabbed": 0, "decoded": 0, "dropped_small": 0}
+
+        self._thread = None
+        if self.alive:
+            self._thread = threading.Thread(
+                target=self._run, name="webcam-capture", daemon=True
+            )
+            self._thread.start()
+        else:
+            self._cap.release()
+
+    # ---------- capture thread ----------
+    def _run(self):
+        failures = 0
+        try:
+            while not self._stop.is_set():
+                if not self._cap.grab():
+                    failures += 1
+                    if failures >= MAX_GRAB_FAILURES:
+                        break
+                    continue
+                failures = 0
+                self.stats["grabbed"] += 1
+
+                with self._cond:
+                    wanted = self._wanted
+                if wanted:
+                    self._decode()
+        finally:
+            self._cap.release()
+            with self._cond:
+                self.alive = False
+                self._cond.notify_all()
+
+    def _decode(self):
+        ok, frame = self._cap.retrieve(self._back)
+        if not ok or frame is None:
+            return
+
+        h, w = frame.shape[:2]
+        if h < MIN_FRAME_SIZE or w < MIN_FRAME_SIZE:
+            self.stats["dropped_small"] += 1
+            return
+
+        self.stats["decoded"] += 1
+        with self._cond:
+            # Swap: the delivered buffer becomes the next decode target
+            self._back, self._front = self._front, frame
+            self._seq += 1
+            self._wanted = False
+            self._cond.notify_all()
+
+    # ---------- consumer side ----------
+    def read(self, timeout=1.0):
+        """
+        Block until a frame newer than this call is decoded and return
+        a private copy of it, or None on timeout / camera loss.
+        """
+        with self._cond:
+            seq = self._seq
+            self._wanted = True
+            if not self._cond.wait_for(
+                lambda: self._seq > seq or not self.alive, timeout
+            ) or self._seq == seq:
+                return None
+            return self._front.copy()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def webcam_frames(
+    source=0,
+    seconds=WEBCAM_SECONDS,
+    interval=WEBCAM_INTERVAL,
+    max_width=MAX_FRAME_WIDTH
+):
+    """
+    Yield the freshest camera frame every `interval` seconds for
+    `seconds`. The loop sleeps between frames; when detection runs
+    longer than `interval`, the next frame is taken right away, so the
+    cadence is max(interval, detection time) with no backlog.
+    """
+    with LatestFrameCapture(source) as capture:
+        deadline = time.monotonic() + seconds
+        next_at = time.monotonic()
+
+        while capture.alive and time.monotonic() < deadline:
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            frame = capture.read()
+            if frame is None:
+                continue
+
+            next_at = time.monotonic() + interval
+            yield downscale(frame, max_width)
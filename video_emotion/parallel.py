@@ -0,0 +1,209 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, util
+
+import numpy as np
+
+from video_emotion.emotion_core import (
+    ANALYSIS_SECONDS,
+    MIN_EMOTION_SAMPLES,
+    FrameDetections,
+    _load_detector,
+    run_analysis,
+)
+
+# Workers are spawned, never forked: the parent (Streamlit, the
+# benchmarks) usually has TensorFlow loaded already, and TensorFlow is
+# not fork-safe. Detector factories must be module-level functions.
+START_METHOD = "spawn"
+
+# ================= WORKER SIDE =================
+# Each worker process holds its own detector and keeps one shared-memory
+# attachment per frame slot between tasks.
+_worker_detector = None
+_worker_blocks = {}
+
+
+def _init_worker(detector_factory):
+    global _worker_detector
+    _worker_detector = detector_factory()
+
+    # Pool shutdown exits workers through multiprocessing, which skips
+    # atexit but runs these finalizers
+    util.Finalize(None, _close_blocks, exitpriority=10)
+
+
+def _close_blocks():
+    for block in _worker_blocks.values():
+        block.close()
+    _worker_blocks.clear()
+
+
+def _attach(slot_id, block_name):
+    block = _worker_blocks.get(slot_id)
+
+    # The slot was regrown into a new block: drop the stale mapping
+    if block is not None and block.name != block_name:
+        block.close()
+        block = None
+
+    if block is None:
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker_blocks[slot_id] = block
+
+    return block
+
+
+def _detect_shared(slot_id, block_name, shape, dtype):
+    block = _attach(slot_id, block_name)
+    frame = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    try:
+        return _worker_detector.detect_emotions(frame)
+    except Exception:
+        return None
+
+# ================= SHARED FRAME SLOTS =================
+class _FrameSlot:
+    """
+    One reusable shared-memory block holding a single frame.
+    """
+
+    def __init__(self, slot_id):
+        self.slot_id = slot_id
+        self.block = None
+
+    def write(self, frame):
+        frame = np.ascontiguousarray(frame)
+
+        if self.block is None or self.block.size < frame.nbytes:
+            self.release()
+            self.block = shared_memory.SharedMemory(
+                create=True, size=max(1, frame.nbytes)
+            )
+
+        view = np.ndarray(frame.shape, dtype=frame.dtype, buffer=self.block.buf)
+        view[...] = frame
+        return self.block.name, frame.shape, frame.dtype.str
+
+    def release(self):
+        if self.block is not None:
+            self.block.close()
+            self.block.unlink()
+            self.block = None
+
+# ================= PARALLEL ANALYZER =================
+class ParallelFrameAnalyzer:
+    """
+    Shards FER detection across a process pool.
+
+    Frames are copied once into a ring of shared-memory slots (never
+    pickled); workers return only the small detection lists, which
+    are consumed in frame order through the same loop as
+    analyze_frames, so the aggregated result is identical.
+
+    Reuse one analyzer across calls: starting workers loads a FER
+    model per process.
+    """
+
+    def __init__(self, workers=None, in_flight=None, detector_factory=_load_detector):
+        self.workers = workers or os.cpu_count() or 1
+        self.in_flight = in_flight or 2 * self.workers
+
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(START_METHOD),
+            initializer=_init_worker,
+            initargs=(detector_factory,)
+        )
+        self._slots = [_FrameSlot(i) for i in range(self.in_flight)]
+
+    def analyze_frames(
+        self,
+        frame_generator,
+        max_seconds=ANALYSIS_SECONDS,
+        min_samples=MIN_EMOTION_SAMPLES
+    ):
+        """
+        Parallel drop-in for emotion_core.analyze_frames.
+        """
+        pending = self._submit_all(frame_generator)
+        try:
+            return run_analysis(pending, _resolve, max_seconds, min_samples)
+        finally:
+            pending.close()
+
+    def close(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        for slot in self._slots:
+            slot.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ================= INTERNALS =================
+    def _submit_all(self, frames):
+        """
+        Yield per-frame handles in order, keeping up to `in_flight`
+        frames queued in the pool ahead of the consumer.
+        """
+        queue = deque()
+        free = deque(self._slots)
+
+        try:
+            for item in frames:
+                if len(queue) >= self.in_flight:
+                    yield queue[0]
+                    _release_handle(queue.popleft(), free)
+
+                if isinstance(item, FrameDetections):
+                    queue.append((item, None))
+                    continue
+
+                slot = free.popleft()
+                name, shape, dtype = slot.write(item)
+                future = self._pool.submit(_detect_shared, slot.slot_id, name, shape, dtype)
+                queue.append((future, slot))
+
+            while queue:
+                yield queue[0]
+                _release_handle(queue.popleft(), free)
+        finally:
+            # Early exit: drop work nobody will read, wait for the rest
+            # so no worker still reads a slot that gets reused
+            for future, slot in queue:
+                if slot is not None and not future.cancel():
+                    future.exception()
+
+
+def _resolve(handle):
+    value, slot = handle
+    if slot is None:
+        return value.detections
+    return value.result()
+
+
+def _release_handle(handle, free):
+    value, slot = handle
+    if slot is not None:
+        # Slot is reusable once its detection has finished
+        value.exception()
+        free.append(slot)
+
+# ================= CONVENIENCE =================
+def analyze_frames_parallel(
+    frame_generator,
+    workers=None,
+    max_seconds=ANALYSIS_SECONDS,
+    min_samples=MIN_EMOTION_SAMPLES
+):
+    """
+    One-shot parallel analysis (spins up and tears down a pool).
+    """
+    with ParallelFrameAnalyzer(workers=workers) as analyzer:
+        return analyzer.analyze_frames(frame_generator, max_seconds, min_samples)
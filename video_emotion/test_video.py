@@ -4,10 +4,11 @@ import os
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, PROJECT_ROOT)
 
-from video_emotion.emotion_detector import analyze_video
+from video_emotion.emotion_core import analyze_frames
+from video_emotion.frame_sources import webcam_frames
 
 if __name__ == "__main__":
     print("🎥 Starting facial emotion analysis...")
-    result = analyze_video(0)
+    result = analyze_frames(webcam_frames(0))
     print("\n🧠 Analysis Result:")
     print(result)
@@ -0,0 +1,114 @@
+import cv2
+import numpy as np
+
+from instrumentation import stage
+from video_emotion.emotion_core import run_detector
+
+# ================= CONFIG =================
+KEYFRAME_INTERVAL = 10      # full Haar + CNN pass every N frames
+MOTION_THRESHOLD = 6.0      # mean abs gray diff (0–255) that re-runs the CNN
+REKEY_THRESHOLD = 25.0      # diff that means the face moved → full detection
+SIGNATURE_SIZE = (32, 32)
+
+# ================= ROI SIGNATURE =================
+def roi_signature(frame, box):
+    """
+    Tiny grayscale thumbnail of a face box, for cheap change checks.
+    """
+    x, y, w, h = (int(v) for v in box)
+    x, y = max(0, x), max(0, y)
+    roi = frame[y:y + h, x:x + w]
+    if roi.size == 0:
+        return None
+
+    if roi.ndim == 3:
+        roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+
+    return cv2.resize(roi, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+# ================= TRACKED DETECTOR =================
+class TrackedEmotionDetector:
+    """
+    detect_emotions() drop-in that skips redundant CNN work.
+
+    - Keyframes (every KEYFRAME_INTERVAL frames, or when no face is
+      tracked) run full Haar face detection + emotion CNN.
+    - In between, face boxes are kept and each frame's ROI is compared
+      with the last classified ROI. Small change → cached emotions are
+      reused; moderate change → the CNN runs on the known boxes only
+      (no Haar pass); large change → full detection again.
+
+    Stateful: use one instance per video stream.
+    """
+
+    def __init__(
+        self,
+        detector,
+        keyframe_interval=KEYFRAME_INTERVAL,
+        motion_threshold=MOTION_THRESHOLD,
+        rekey_threshold=REKEY_THRESHOLD
+    ):
+        self.detector = detector
+        self.keyframe_interval = keyframe_interval
+        self.motion_threshold = motion_threshold
+        self.rekey_threshold = rekey_threshold
+
+        self.stats = {"frames": 0, "full": 0, "roi": 0, "reused": 0}
+        self._since_keyframe = 0
+        self._detections = []
+        self._signatures = []
+
+    def detect_emotions(self, frame):
+        self.stats["frames"] += 1
+        self._since_keyframe += 1
+
+        if not self._detections or self._since_keyframe >= self.keyframe_interval:
+            return self._full(frame)
+
+        signatures = [roi_signature(frame, d["box"]) for d in self._detections]
+        if any(s is None for s in signatures):
+            return self._full(frame)
+
+        change = max(
+            float(np.mean(np.abs(new - old)))
+            for new, old in zip(signatures, self._signatures)
+        )
+
+        if change >= self.rekey_threshold:
+            return self._full(frame)
+
+        if change >= self.motion_threshold:
+            return self._classify(frame, signatures)
+
+        self.stats["reused"] += 1
+        return _copy(self._detections)
+
+    # ================= INTERNALS =================
+    def _full(self, frame):
+        self.stats["full"] += 1
+        self._since_keyframe = 0
+        return self._remember(frame, run_detector(self.detector, frame))
+
+    def _classify(self, frame, signatures):
+        self.stats["roi"] += 1
+        boxes = [tuple(d["box"]) for d in self._detections]
+        with stage("emotion_classify"):
+            detections = self.detector.detect_emotions(frame, face_rectangles=boxes)
+        return self._remember(frame, detections, signatures)
+
+    def _remember(self, frame, detections, signatures=None):
+        detections = detections or []
+        if signatures is None or len(signatures) != len(detections):
+            signatures = [roi_signature(frame, d["box"]) for d in detections]
+
+        if any(s is None for s in signatures):
+            detections, signatures = [], []
+
+        self._detections = detections
+        self._signatures = signatures
+        return _copy(detections)
+
+
+def _copy(detections):
+    # Callers (the overlay) must not mutate the cached detections
+    return [{**d, "emotions": dict(d.get("emotions", {}))} for d in detections]
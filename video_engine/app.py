@@ -16,10 +16,20 @@ import streamlit as st
 import cv2
 import time
 import tempfile
-import requests
-from fer import FER
-from collections import deque, Counter
-from video_emotion.emotion_core import analyze_frames
+import uuid
+from collections import Counter
+from contextlib import closing
+from video_emotion.emotion_core import (
+    FrameDetections,
+    SlidingMode,
+    analyze_frames,
+    get_detector,
+    run_detector,
+)
+from instrumentation import summary as metrics_summary
+from video_emotion.frame_sources import video_file_frames, webcam_frames
+from video_emotion.tracking import TrackedEmotionDetector
+from video_engine.delivery import ResultDelivery
 
 # =========================================================
 # STREAMLIT CONFIG
@@ -56,6 +66,13 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+# =========================================================
+# DASHBOARD SESSION (passed by the Flask "Open" link)
+# =========================================================
+session_id = st.query_params.get("session_id")
+if not session_id:
+    st.info("Open this page from the dashboard to link results to your session.")
+
 # =========================================================
 # INPUT MODE
 # =========================================================
@@ -65,21 +82,48 @@ mode = st.radio(
     horizontal=True
 )
 
+# Uploader must render before Start, or the file is lost on rerun
+uploaded = None
+if mode == "📁 Upload Video":
+    uploaded = st.file_uploader("Upload video", type=["mp4", "avi", "mov"])
+
+tracking = st.checkbox(
+    "⚡ Tracking mode (re-classify the face only when it changes)",
+    value=False
+)
+
 start = st.button("🚀 Start Analysis", use_container_width=True)
 
+# =========================================================
+# STAGE TIMINGS (SIDEBAR)
+# =========================================================
+st.sidebar.markdown("### ⏱️ Stage Timings")
+metrics_panel = st.sidebar.empty()
+
+
+def render_metrics_panel():
+    stats = metrics_summary()
+    if not stats:
+        metrics_panel.caption("No timings yet — run an analysis.")
+        return
+    metrics_panel.table([{"stage": name, **row} for name, row in stats.items()])
+
+
+render_metrics_panel()
+
 # =========================================================
 # FACE DETECTOR (STABLE MODE)
 # =========================================================
 # ❌ mtcnn=True causes Conv2D crashes on empty faces
 # ✅ Haar cascade is stable for free deployment
-face_detector = FER(mtcnn=False)
+# Shared with emotion_core via the model registry (one FER per process)
+face_detector = get_detector()
 
 # =========================================================
 # SMOOTHING CONFIG
 # =========================================================
 SMOOTHING_WINDOW = 7
-emotion_buffer = deque(maxlen=SMOOTHING_WINDOW)
-confidence_buffer = deque(maxlen=SMOOTHING_WINDOW)
+emotion_smoother = SlidingMode(SMOOTHING_WINDOW)
 
 NEGATIVE = {"angry", "sad", "fear", "disgust"}
 
@@ -97,111 +141,90 @@ def emotion_to_risk(emotion):
 # SMOOTHING
 # =========================================================
 def smooth_emotion(emotion, confidence):
-    emotion_buffer.append(emotion)
-    confidence_buffer.append(confidence)
-
-    dominant = Counter(emotion_buffer).most_common(1)[0][0]
-    avg_conf = sum(confidence_buffer) / len(confidence_buffer)
-
-    return dominant, avg_conf
+    # O(1) sliding-window mode + mean confidence
+    return emotion_smoother.push(emotion, confidence)
 
 # =========================================================
-# SAFE WEBCAM STREAM
+# DETECTION + OVERLAY STREAM (ANY FRAME SOURCE)
 # =========================================================
-def webcam_stream(preview, emotion_counter):
-    cap = cv2.VideoCapture(0)
-    start_time = time.time()
-    last_capture = time.time()
+PREVIEW_INTERVAL = 0.25   # seconds between preview refreshes
+PARTIAL_INTERVAL = 2.0    # seconds between live partial results
 
-    while time.time() - start_time <= 15:
-        ret, frame = cap.read()
-        if not ret:
-            continue
 
-        h, w, _ = frame.shape
-        if h < 100 or w < 100:
-            continue
+def detect_stream(frames, preview, emotion_counter, detector=None, on_progress=None):
+    detector = detector or face_detector
+    last_preview = 0.0
+    last_progress = time.time()
 
-        if time.time() - last_capture < 0.3:
-            continue
-        last_capture = time.time()
-
-        try:
-            detections = face_detector.detect_emotions(frame)
-            if not detections:
-                preview.image(frame, channels="BGR")
-                continue
-        except Exception:
+    def show(frame):
+        nonlocal last_preview
+        if time.time() - last_preview >= PREVIEW_INTERVAL:
             preview.image(frame, channels="BGR")
-            continue
+            last_preview = time.time()
 
-        for d in detections:
-            emotions = d.get("emotions", {})
-            if not emotions:
+    try:
+        for frame in frames:
+            try:
+                detections = run_detector(detector, frame)
+                if not detections:
+                    show(frame)
+                    continue
+            except Exception:
+                show(frame)
                 continue
 
-            emo = max(emotions, key=emotions.get)
-            conf = emotions[emo]
-
-            emotion_counter[emo] += 1
-            smooth_label, smooth_conf = smooth_emotion(emo, conf)
-
-            x, y, w, h = d["box"]
-            cv2.rectangle(frame, (x, y), (x + w, y + h), (0,255,0), 2)
-            cv2.putText(
-                frame,
-                f"{smooth_label} ({int(smooth_conf*100)}%)",
-                (x, y - 10),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.6,
-                (0,255,0),
-                2
-            )
-
-        preview.image(frame, channels="BGR")
-        yield frame
-
-    cap.release()
+            for d in detections:
+                emotions = d.get("emotions", {})
+                if not emotions:
+                    continue
+
+                emo = max(emotions, key=emotions.get)
+                conf = emotions[emo]
+
+                emotion_counter[emo] += 1
+                smooth_label, smooth_conf = smooth_emotion(emo, conf)
+
+                x, y, w, h = d["box"]
+                cv2.rectangle(frame, (x, y), (x + w, y + h), (0,255,0), 2)
+                cv2.putText(
+                    frame,
+                    f"{smooth_label} ({int(smooth_conf*100)}%)",
+                    (x, y - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.6,
+                    (0,255,0),
+                    2
+                )
+
+            show(frame)
+
+            if on_progress and time.time() - last_progress >= PARTIAL_INTERVAL:
+                on_progress()
+                last_progress = time.time()
+
+            # Pass detections along so analyze_frames doesn't re-run FER
+            yield FrameDetections(frame, detections)
+    finally:
+        # Stop the camera thread / release the file as soon as analysis ends
+        close = getattr(frames, "close", None)
+        if close:
+            close()
 
 # =========================================================
-# SEND TO FLASK
+# SAFE WEBCAM STREAM
 # =========================================================
-def send_to_flask(payload):
-    FLASK_API = "http://127.0.0.1:5000/api/video-result"
-    try:
-        r = requests.post(FLASK_API, json=payload, timeout=5)
-        if r.status_code == 200:
-            st.success("📤 Result sent to Flask")
-        else:
-            st.error("❌ Flask rejected payload")
-    except Exception:
-        st.error("❌ Flask server not running")
+def webcam_stream(preview, emotion_counter, detector=None, on_progress=None):
+    return detect_stream(
+        webcam_frames(), preview, emotion_counter, detector, on_progress
+    )
 
 # =========================================================
-# MAIN EXECUTION
+# PAYLOAD
 # =========================================================
-if start:
-    # RESET STATE
-    emotion_buffer.clear()
-    confidence_buffer.clear()
-    emotion_counter = Counter()
-
-    preview = st.empty()
-
-    with st.spinner("Analyzing facial emotions (~15s)…"):
-        if mode == "🎥 Webcam":
-            result = analyze_frames(webcam_stream(preview, emotion_counter))
-        else:
-            uploaded = st.file_uploader("Upload video", type=["mp4", "avi", "mov"])
-            if uploaded is None:
-                st.stop()
-
-            with tempfile.NamedTemporaryFile(delete=False) as tmp:
-                tmp.write(uploaded.read())
-                video_path = tmp.name
+PARTIAL_CONFIDENCE = 0.7   # live estimates are marked as less certain
 
-            result = analyze_frames(webcam_stream(preview, emotion_counter))
 
+def build_payload(emotion_counter, confidence, explanation):
     # SAFE FALLBACK
     dominant_emotion = (
         emotion_counter.most_common(1)[0][0]
@@ -210,10 +233,10 @@ if start:
 
     total = sum(emotion_counter.values()) or 1
 
-    video_payload = {
+    return {
         "source": "video",
         "risk_level": emotion_to_risk(dominant_emotion),
-        "confidence": round(result.get("reliability", 0.7), 2),
+        "confidence": round(confidence, 2),
         "signals": {
             "dominant_emotion": dominant_emotion,
             "emotion_distribution": {
@@ -221,13 +244,118 @@ if start:
                 for k, v in emotion_counter.items()
             }
         },
-        "explanation": "Facial emotion analysis over 15 seconds"
+        "explanation": explanation
     }
 
+# =========================================================
+# SEND TO FLASK (POOLED, BACKGROUND, SPOOLED ON FAILURE)
+# =========================================================
+@st.cache_resource
+def get_delivery():
+    # One sender thread + keep-alive connection for every dashboard
+    # session, kept across Streamlit reruns
+    return ResultDelivery()
+
+
+delivery = get_delivery()
+
+
+def send_to_flask(payload, run_id, partial=False):
+    if not session_id:
+        if not partial:
+            st.error("❌ No dashboard session — result not sent")
+        return
+
+    delivery.send({**payload, "run_id": run_id}, partial=partial, session_id=session_id)
+    if partial:
+        return
+
+    # Delivery carries on in the background; only wait briefly for feedback
+    if not delivery.flush(timeout=1.0):
+        st.info("📤 Result queued for Flask")
+    elif delivery.pending_spool():
+        st.warning("📦 Flask unreachable — result saved, will retry in the background")
+    elif delivery.last_error:
+        st.error(f"❌ Flask rejected payload ({delivery.last_error})")
+    else:
+        st.success("📤 Result sent to Flask")
+
+# =========================================================
+# MAIN EXECUTION
+# =========================================================
+if start:
+    # RESET STATE
+    emotion_smoother.clear()
+    emotion_counter = Counter()
+
+    preview = st.empty()
+    run_id = uuid.uuid4().hex
+
+    # Tracker state is per stream, so build a fresh one each run
+    detector = TrackedEmotionDetector(face_detector) if tracking else face_detector
+
+    def send_partial():
+        send_to_flask(
+            build_payload(
+                emotion_counter,
+                PARTIAL_CONFIDENCE,
+                "Live estimate — facial emotion analysis in progress"
+            ),
+            run_id,
+            partial=True
+        )
+
+    if mode == "🎥 Webcam":
+        with st.spinner("Analyzing facial emotions (~15s)…"), closing(
+            webcam_stream(preview, emotion_counter, detector, send_partial)
+        ) as frames:
+            # analyze_frames may stop early; closing() stops the camera then
+            result = analyze_frames(frames)
+        explanation = "Facial emotion analysis over 15 seconds"
+    else:
+        if uploaded is None:
+            st.warning("Please upload a video first.")
+            st.stop()
+
+        suffix = os.path.splitext(uploaded.name)[1] or ".mp4"
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            tmp.write(uploaded.getbuffer())
+            video_path = tmp.name
+
+        try:
+            with st.spinner("Analyzing uploaded video…"):
+                # Whole clip: no wall-clock budget, no early exit
+                result = analyze_frames(
+                    detect_stream(
+                        video_file_frames(video_path),
+                        preview,
+                        emotion_counter,
+                        detector,
+                        send_partial
+                    ),
+                    max_seconds=None,
+                    min_samples=None
+                )
+        finally:
+            os.remove(video_path)
+        explanation = "Facial emotion analysis over the uploaded video"
+
+    video_payload = build_payload(
+        emotion_counter, result.get("reliability", 0.7), explanation
+    )
+
     st.success("✅ Analysis Complete")
+    if tracking:
+        stats = detector.stats
+        st.caption(
+            f"⚡ Tracking: {stats['full']} full detections, "
+            f"{stats['roi']} face re-classifications, "
+            f"{stats['reused']} reused of {stats['frames']} frames"
+        )
     st.markdown("### 🧠 Standardized Video Output")
     st.markdown("<div class='glass'>", unsafe_allow_html=True)
     st.json(video_payload)
     st.markdown("</div>", unsafe_allow_html=True)
 
-    send_to_flask(video_payload)
+    send_to_flask(video_payload, run_id)
+    render_metrics_panel()
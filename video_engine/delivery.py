@@ -0,0 +1,202 @@
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# =========================================================
+# CONFIG
+# =========================================================
+FLASK_API = os.environ.get(
+    "FLASK_API", "http://127.0.0.1:5000/api/video-result"
+)
+SPOOL_DIR = os.environ.get(
+    "VIDEO_SPOOL_DIR", os.path.join(os.path.dirname(__file__), "spool")
+)
+REQUEST_TIMEOUT = 5          # seconds per POST
+MAX_ATTEMPTS = 4             # final results; partials get one attempt
+BACKOFF_SECONDS = 0.5        # doubled per retry
+BACKOFF_MAX_SECONDS = 8.0
+SPOOL_RETRY_SECONDS = 15     # idle sender re-tries the spool this often
+
+# =========================================================
+# DELIVERY CLIENT
+# =========================================================
+class ResultDelivery:
+    """
+    Non-blocking delivery of video results to the Flask dashboard.
+
+    - send() only enqueues; a background thread does the POSTs over
+      one pooled keep-alive session.
+    - Final results are retried with exponential backoff, then written
+      to an on-disk spool. The spool is drained (oldest first) before
+      anything newer is sent, so a late spooled result never
+      overwrites a newer one.
+    - Partial results are coalesced to the latest one per session and
+      dropped on failure, since the next partial or final supersedes
+      them.
+
+    One client can serve every dashboard session: send() takes the
+    session id per payload.
+    """
+
+    def __init__(self, session_id=None, url=FLASK_API, spool_dir=SPOOL_DIR, timeout=REQUEST_TIMEOUT):
+        self.session_id = session_id
+        self.url = url
+        self.spool_dir = spool_dir
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+
+        self._queue = queue.Queue()
+        self._latest_partials = {}
+        self._partial_lock = threading.Lock()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+        self.stats = {"sent": 0, "retries": 0, "spooled": 0, "dropped_partials": 0}
+        self.last_error = None
+
+        os.makedirs(self.spool_dir, exist_ok=True)
+
+    # ================= PUBLIC =================
+    def send(self, payload, partial=False, session_id=None):
+        """
+        Queue a payload for `session_id` (default: this client's
+        session_id, unless the payload carries its own). Returns
+        immediately.
+        """
+        payload = {"session_id": self.session_id, **payload, "partial": partial}
+        if session_id:
+            payload["session_id"] = session_id
+        self._ensure_thread()
+
+        if partial:
+            key = payload["session_id"]
+            with self._partial_lock:
+                if key in self._latest_partials:
+                    self.stats["dropped_partials"] += 1
+                self._latest_partials[key] = payload
+            self._queue.put(None)
+        else:
+            self._queue.put(payload)
+
+    def flush(self, timeout=None):
+        """
+        Wait until everything queued so far has been sent or spooled.
+        """
+        done = threading.Event()
+        self._ensure_thread()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def pending_spool(self):
+        return sorted(
+            name for name in os.listdir(self.spool_dir) if name.endswith(".json")
+        )
+
+    # ================= SENDER THREAD =================
+    def _ensure_thread(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="video-result-delivery", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=SPOOL_RETRY_SECONDS)
+            except queue.Empty:
+                self._drain_spool()
+                continue
+
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+
+            if not self._drain_spool():
+                # Still offline: don't jump ahead of older results
+                if item is not None:
+                    self._spool(item)
+                else:
+                    self._take_partials()
+                continue
+
+            if item is None:
+                for partial in self._take_partials():
+                    self._post(partial, attempts=1)
+            elif not self._post(item, attempts=MAX_ATTEMPTS):
+                self._spool(item)
+
+    def _take_partials(self):
+        with self._partial_lock:
+            partials, self._latest_partials = self._latest_partials, {}
+        return list(partials.values())
+
+    def _post(self, payload, attempts):
+        delay = BACKOFF_SECONDS
+        for attempt in range(attempts):
+            if attempt:
+                self.stats["retries"] += 1
+                time.sleep(delay)
+                delay = min(delay * 2, BACKOFF_MAX_SECONDS)
+            try:
+                r = self.session.post(self.url, json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                self.last_error = str(e)
+                continue
+
+            if r.status_code == 200:
+                self.stats["sent"] += 1
+                self.last_error = None
+                return True
+
+            self.last_error = f"HTTP {r.status_code}"
+            if 400 <= r.status_code < 500:
+                # Rejected payload: retrying or spooling won't help
+                return True
+        return False
+
+    # ================= SPOOL =================
+    def _spool(self, payload):
+        name = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.json"
+        tmp = os.path.join(self.spool_dir, name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp, os.path.join(self.spool_dir, name))
+        self.stats["spooled"] += 1
+
+    def _drain_spool(self):
+        """
+        Re-send spooled results oldest first. True once the spool is empty.
+        """
+        for name in self.pending_spool():
+            path = os.path.join(self.spool_dir, name)
+            try:
+                with open(path) as f:
+                    payload = json.load(f)
+            except FileNotFoundError:
+                continue        # drained by another client
+            except (OSError, ValueError):
+                self._discard(path)
+                continue
+
+            if not self._post(payload, attempts=1):
+                return False
+            self._discard(path)
+        return True
+
+    @staticmethod
+    def _discard(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass